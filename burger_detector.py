@@ -0,0 +1,199 @@
+import functools
+
+import cv2
+import numpy as np
+
+
+@functools.lru_cache(maxsize=None)
+def structuring_element(size):
+    """Elliptical kernel of the given size, built once and reused for every frame."""
+    return cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (size, size))
+
+
+def in_hsv_range(hsv, lower, upper):
+    """Boolean inRange for an (N, 3) array of HSV values, with the same hue wrap-around as threshold()."""
+    inside = np.all((hsv[:, 1:] >= lower[1:]) & (hsv[:, 1:] <= upper[1:]), axis=1)
+    if lower[0] <= upper[0]:
+        return inside & (hsv[:, 0] >= lower[0]) & (hsv[:, 0] <= upper[0])
+    return inside & ((hsv[:, 0] >= lower[0]) | (hsv[:, 0] <= upper[0]))
+
+
+def hue_classes(hues, class_hues):
+    """1 + index of the nearest class hue (circular distance) for each hue."""
+    distance = np.abs(np.asarray(hues, dtype=int)[:, None] - np.asarray(class_hues, dtype=int)[None, :])
+    return 1 + np.argmin(np.minimum(distance, 180 - distance), axis=1)
+
+
+class ColorTable:
+    """Quantized BGR -> class lookup table, so a frame is segmented without an HSV conversion.
+
+    Every channel is reduced to `bits` bits (64 levels, 64^3 one-byte entries
+    by default). Each entry is classified once from the HSV value of its bin
+    center: 0 outside the detector's bounds, otherwise 1 + the nearest of
+    `class_hues` (raw/half/cooked), or just 1 without class hues. The table is
+    only rebuilt when the bounds change.
+    """
+
+    def __init__(self, lower, upper, class_hues=None, bits=6):
+        shift = 8 - bits
+        centers = (np.arange(1 << bits) << shift) + (1 << shift) // 2
+        b, g, r = np.meshgrid(centers, centers, centers, indexing="ij")
+        bgr = np.stack([b, g, r], axis=-1).astype(np.uint8).reshape(-1, 1, 3)
+        hsv = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV).reshape(-1, 3).astype(int)
+
+        classes = hue_classes(hsv[:, 0], class_hues) if class_hues else np.ones(len(hsv), dtype=int)
+        self.table = np.where(in_hsv_range(hsv, lower, upper), classes, 0).astype(np.uint8)
+        self.classes = len(class_hues) if class_hues else 1
+
+        # Each channel's share of the table index, applied per pixel by cv2.LUT and summed by cv2.transform
+        value = np.arange(256) >> shift
+        self.index_lut = np.stack([value << (2 * bits), value << bits, value], axis=-1).astype(np.float32)
+        self.index_lut = self.index_lut.reshape(1, 256, 3)
+        self.channel_sum = np.ones((1, 3), dtype=np.float32)
+
+    def index(self, image):
+        """Table index of every pixel of a BGR image."""
+        return cv2.transform(cv2.LUT(image, self.index_lut), self.channel_sum).astype(np.int32)
+
+    def lookup(self, index):
+        return self.table.take(index)
+
+    def segment(self, image):
+        """Class label of every pixel (0 background, 1..classes), in one table lookup."""
+        return self.lookup(self.index(image))
+
+
+class BurgerDetector:
+    """Finds burger patties in a BGR frame using color, blob area and roundness.
+
+    Detection can be limited to the griddle region of interest (`roi`, as
+    x, y, w, h in full-resolution pixels) and run on a downscaled copy
+    (`scale` < 1). Boxes are always returned in full-resolution coordinates.
+
+    The mask is cleaned with a morphological open (removes speckle from steam
+    and grease) and close (fills holes), then blobs are measured with one
+    connectedComponentsWithStats call and filtered by area and circularity as
+    NumPy arrays. Per-frame Python work therefore doesn't grow with noise.
+
+    With segmentation="lut" the mask comes from a ColorTable instead of an
+    HSV conversion plus inRange. segment() returns per-pixel cooking classes
+    (0 background, then one per `class_hues` entry) with either method.
+    Building the table index costs more than cvtColor + inRange on 720p
+    frames, so the app uses HSV; check with detection_benchmark.py --compare
+    before switching.
+    """
+
+    def __init__(self, lower=(5, 50, 50), upper=(30, 255, 255), min_area=500, roi=None, scale=1.0,
+                 open_size=5, close_size=5, min_circularity=0.3, segmentation="hsv", class_hues=None):
+        # Color range for browned patties (adjust if needed, or fit it in the Calibration tab)
+        self.lower = np.array(lower)
+        self.upper = np.array(upper)
+        self.min_area = min_area  # Measured in full-resolution pixels
+        self.roi = roi
+        self.scale = scale
+        self.open_size = open_size    # Kernel sizes in full-resolution pixels, 0 to skip
+        self.close_size = close_size
+        self.min_circularity = min_circularity  # 1 for a filled circle, 0 to skip the test
+        self.segmentation = segmentation
+        self.class_hues = list(class_hues) if class_hues else None  # E.g. the reference hues, ordered like STATES
+        self.color_table = None
+        self._build_tables()
+
+    def set_bounds(self, lower, upper):
+        """Replaces the color range, e.g. after calibration."""
+        self.lower = np.array(lower)
+        self.upper = np.array(upper)
+        self._build_tables()
+
+    def _build_tables(self):
+        if self.segmentation == "lut":
+            self.color_table = ColorTable(self.lower, self.upper, self.class_hues)
+        # Hue -> class for the HSV path, indexed by cv2.LUT
+        classes = hue_classes(np.arange(256) % 180, self.class_hues) if self.class_hues else np.ones(256)
+        self.hue_class_lut = classes.astype(np.uint8)
+
+    def prepare(self, frame):
+        """Crops to the ROI and downscales. Returns the image and its (x, y) offset."""
+        offset = (0, 0)
+        if self.roi:
+            x, y, w, h = self.clip_roi(frame.shape)
+            frame = frame[y:y + h, x:x + w]
+            offset = (x, y)
+        if self.scale != 1.0:
+            frame = cv2.resize(frame, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        return frame, offset
+
+    def clip_roi(self, shape):
+        """Keeps the ROI inside a frame of the given shape."""
+        height, width = shape[:2]
+        x, y, w, h = self.roi
+        x, y = max(0, min(x, width - 1)), max(0, min(y, height - 1))
+        return x, y, max(1, min(w, width - x)), max(1, min(h, height - y))
+
+    def to_hsv(self, image):
+        return cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+
+    def threshold(self, hsv):
+        if self.lower[0] <= self.upper[0]:
+            return cv2.inRange(hsv, self.lower, self.upper)
+        # A lower hue above the upper hue wraps through red (179 -> 0), e.g. raw patties
+        mask = cv2.inRange(hsv, self.lower, np.array([179, self.upper[1], self.upper[2]]))
+        return cv2.bitwise_or(mask, cv2.inRange(hsv, np.array([0, self.lower[1], self.lower[2]]), self.upper))
+
+    def mask(self, image):
+        if self.color_table:
+            return cv2.compare(self.color_table.segment(image), 0, cv2.CMP_GT)
+        return self.threshold(self.to_hsv(image))
+
+    def segment(self, image):
+        """Cooking class of every pixel: 0 for background, 1 + the nearest class hue otherwise."""
+        if self.color_table:
+            return self.color_table.segment(image)
+        hsv = self.to_hsv(image)
+        classes = cv2.LUT(hsv[:, :, 0], self.hue_class_lut)
+        return cv2.bitwise_and(classes, classes, mask=self.threshold(hsv))
+
+    def refine(self, mask):
+        """Opens then closes the mask with cached kernels scaled to the detection size."""
+        for size, operation in ((self.open_size, cv2.MORPH_OPEN), (self.close_size, cv2.MORPH_CLOSE)):
+            size = int(round(size * self.scale))
+            if size > 1:
+                mask = cv2.morphologyEx(mask, operation, structuring_element(size))
+        return mask
+
+    def find_boxes(self, mask, offset=(0, 0)):
+        """Boxes of the large, round enough blobs in a refined mask, in full-resolution coordinates."""
+        offset_x, offset_y = offset
+        _, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+        stats = stats[1:]  # Row 0 is the background
+        area = stats[:, cv2.CC_STAT_AREA]
+        width, height = stats[:, cv2.CC_STAT_WIDTH], stats[:, cv2.CC_STAT_HEIGHT]
+
+        keep = area > self.min_area * self.scale * self.scale  # Ignore small noise
+        if self.min_circularity:
+            # Area relative to the circle spanning the blob's longer side
+            circularity = 4 * area / (np.pi * np.maximum(width, height) ** 2)
+            keep &= circularity >= self.min_circularity
+        kept = stats[keep]
+
+        xs = (kept[:, cv2.CC_STAT_LEFT] / self.scale).astype(int) + offset_x
+        ys = (kept[:, cv2.CC_STAT_TOP] / self.scale).astype(int) + offset_y
+        ws = np.round(kept[:, cv2.CC_STAT_WIDTH] / self.scale).astype(int)
+        hs = np.round(kept[:, cv2.CC_STAT_HEIGHT] / self.scale).astype(int)
+        return list(zip(xs.tolist(), ys.tolist(), ws.tolist(), hs.tolist()))
+
+    def detect(self, frame):
+        """Returns a list of (x, y, w, h) boxes in full-resolution frame coordinates."""
+        image, offset = self.prepare(frame)
+        return self.find_boxes(self.refine(self.mask(image)), offset)
+
+    def draw(self, frame, boxes, labels=None):
+        """Draws the detection boxes (and the ROI outline, if any) onto the frame."""
+        if self.roi:
+            x, y, w, h = self.clip_roi(frame.shape)
+            cv2.rectangle(frame, (x, y), (x + w, y + h), (128, 128, 128), 1)
+        labels = labels or ["Burger"] * len(boxes)
+        for (x, y, w, h), label in zip(boxes, labels):
+            cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)  # Draw bounding box
+            cv2.putText(frame, label, (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
+        return frame
@@ -0,0 +1,221 @@
+"""Calibration of the patty colors and of the camera-to-simulated-view mapping.
+
+The HSV bounds are fitted from the reference patty images and from patties
+seen in sample camera frames. The mapping is a homography from camera pixels
+to canvas pixels of the Simulated View, found by projecting a checkerboard
+there and detecting it in the camera image. Both are saved together in a
+versioned JSON profile.
+"""
+import json
+import os
+import time
+
+import cv2
+import numpy as np
+
+from cooking_classifier import REFERENCE_IMAGES
+
+CALIBRATION_FILE = "calibration.json"
+CALIBRATION_VERSION = 1
+CHECKERBOARD = (9, 6)   # Inner corners (columns, rows); odd x even so the board has no 180 degree symmetry
+
+
+class CalibrationProfile:
+    """HSV detection bounds plus the camera-to-canvas homography (either may be None)."""
+
+    def __init__(self, lower=None, upper=None, homography=None, frame_size=None, canvas_size=None,
+                 mapping_error=None, created=None, version=CALIBRATION_VERSION):
+        self.version = version
+        self.lower = lower
+        self.upper = upper
+        self.homography = homography        # 3x3 nested list, camera pixels -> canvas pixels
+        self.frame_size = frame_size        # (width, height) of the camera frames it was measured on
+        self.canvas_size = canvas_size      # (width, height) of the canvas it maps to
+        self.mapping_error = mapping_error  # Mean checkerboard reprojection error in canvas pixels
+        self.created = created or time.time()
+
+    def to_dict(self):
+        return dict(self.__dict__)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+def load_calibration(path=CALIBRATION_FILE):
+    """Returns the saved profile, or None if there is none or it was written by another version."""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != CALIBRATION_VERSION:
+        print(f"Warning: Ignoring {path}, calibration version {data.get('version')} is not supported.")
+        return None
+    try:
+        return CalibrationProfile.from_dict(data)
+    except TypeError as e:
+        print(f"Warning: Ignoring {path}: {e}")
+        return None
+
+
+def save_calibration(profile, path=CALIBRATION_FILE):
+    try:
+        with open(path + ".tmp", "w") as f:
+            json.dump(profile.to_dict(), f, indent=2)
+        os.replace(path + ".tmp", path)
+    except OSError as e:
+        print(f"Warning: Could not save calibration: {e}")
+
+
+def patty_pixels(image, boxes=None, min_value=40, min_saturation=40):
+    """HSV pixels from the middle of each box (or of the whole image), skipping dark and gray ones.
+
+    Only the inner half of every box is used so griddle pixels around the
+    patty edge don't widen the fitted range.
+    """
+    hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+    if boxes is None:
+        boxes = [(0, 0, image.shape[1], image.shape[0])]
+    pixels = [hsv[y + h // 4:y + 3 * h // 4, x + w // 4:x + 3 * w // 4].reshape(-1, 3) for x, y, w, h in boxes]
+    pixels = np.concatenate(pixels) if pixels else np.empty((0, 3), dtype=np.uint8)
+    return pixels[(pixels[:, 2] >= min_value) & (pixels[:, 1] >= min_saturation)]
+
+
+def hue_range(hues, low, high, margin):
+    """Percentile range of circular hues. A lower bound above the upper one wraps through red (0/179)."""
+    hues = hues.astype(int)
+    spans = []
+    for shift in (0, 90):  # Measured as is and rotated half way, the narrower one doesn't cross 0
+        lower, upper = np.percentile((hues + shift) % 180, [low, high])
+        spans.append((upper - lower, lower - shift, upper - shift))
+    width, lower, upper = min(spans)
+    if width + 2 * margin >= 179:
+        return 0, 179
+    return int(lower - margin) % 180, int(upper + margin) % 180
+
+
+def fit_hsv_bounds(pixels, low=5, high=95, margin=(3, 25, 25)):
+    """Fits detector bounds to HSV pixels: the low/high percentiles of each channel plus a margin."""
+    hue_lower, hue_upper = hue_range(pixels[:, 0], low, high, margin[0])
+    lower = np.clip(np.percentile(pixels[:, 1:], low, axis=0) - margin[1:], 0, 255).astype(int).tolist()
+    upper = np.clip(np.percentile(pixels[:, 1:], high, axis=0) + margin[1:], 0, 255).astype(int).tolist()
+    return [hue_lower] + lower, [hue_upper] + upper
+
+
+def fit_colors(frames=(), detector=None, reference_images=REFERENCE_IMAGES):
+    """HSV bounds from the reference images and the patties `detector` finds in sample frames.
+
+    Returns (lower, upper), or None if there were no usable pixels.
+    """
+    pixels = []
+    for path in reference_images:
+        image = cv2.imread(path)
+        if image is not None:
+            pixels.append(patty_pixels(image))
+    for frame in frames:
+        boxes = detector.detect(frame) if detector else None
+        if boxes:
+            pixels.append(patty_pixels(frame, boxes))
+    pixels = np.concatenate(pixels) if pixels else np.empty((0, 3))
+    if len(pixels) < 100:
+        return None
+    return fit_hsv_bounds(pixels)
+
+
+def checkerboard_squares(width, height, pattern=CHECKERBOARD, margin=0.1):
+    """Black squares of a checkerboard filling a width x height canvas, and its inner corners.
+
+    Returns ([(x0, y0, x1, y1)], corners) where corners is an (N, 2) float32
+    array in the row-major order findChessboardCorners reports.
+    """
+    cols, rows = pattern[0] + 1, pattern[1] + 1
+    square = min(width * (1 - 2 * margin) / cols, height * (1 - 2 * margin) / rows)
+    left, top = (width - square * cols) / 2, (height - square * rows) / 2
+    squares = [(left + c * square, top + r * square, left + (c + 1) * square, top + (r + 1) * square)
+               for r in range(rows) for c in range(cols) if (r + c) % 2 == 0]
+    grid = np.mgrid[1:cols, 1:rows].T.reshape(-1, 2).astype(np.float32)
+    return squares, grid * square + np.array([left, top], dtype=np.float32)
+
+
+def find_checkerboard(frame, pattern=CHECKERBOARD):
+    """Sub-pixel inner corners of the checkerboard in a camera frame, or None if it isn't visible.
+
+    The corners are returned in the order of checkerboard_squares, whether
+    the frame is mirrored or not: rows run top to bottom (the camera is
+    assumed to be roughly upright) and columns start on the board's black
+    side. Its outer corner squares are black on the left and white on the
+    right, so a mirrored frame is recognized from the colors.
+    """
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    found, corners = cv2.findChessboardCorners(gray, pattern, flags=cv2.CALIB_CB_ADAPTIVE_THRESH | cv2.CALIB_CB_NORMALIZE_IMAGE)
+    if not found:
+        return None
+    criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.01)
+    corners = cv2.cornerSubPix(gray, corners, (11, 11), (-1, -1), criteria)
+    grid = corners.reshape(pattern[1], pattern[0], 2)
+    if grid[0, :, 1].mean() > grid[-1, :, 1].mean():
+        grid = grid[::-1]
+    if corner_square_brightness(gray, grid[0, 0], grid[1, 1]) > corner_square_brightness(gray, grid[0, -1], grid[1, -2]):
+        grid = grid[:, ::-1]
+    return np.ascontiguousarray(grid.reshape(-1, 2))
+
+
+def corner_square_brightness(gray, corner, inner):
+    """Mean gray level around the center of the outer square diagonally beyond `corner` (away from `inner`)."""
+    x, y = corner + (corner - inner) / 2
+    radius = max(1, int(np.linalg.norm(corner - inner) / 6))
+    height, width = gray.shape
+    x, y = int(np.clip(x, 0, width - 1)), int(np.clip(y, 0, height - 1))
+    return float(gray[max(0, y - radius):y + radius + 1, max(0, x - radius):x + radius + 1].mean())
+
+
+def fit_homography(camera_corners, canvas_corners):
+    """Camera-to-canvas homography and its mean reprojection error in canvas pixels."""
+    homography, _ = cv2.findHomography(camera_corners, canvas_corners, cv2.RANSAC, 3.0)
+    if homography is None:
+        return None, None
+    projected = cv2.perspectiveTransform(camera_corners.reshape(-1, 1, 2), homography).reshape(-1, 2)
+    return homography, float(np.linalg.norm(projected - canvas_corners, axis=1).mean())
+
+
+class CoordinateMapper:
+    """Maps camera pixels to canvas pixels through a precomputed lookup table.
+
+    The homography is evaluated once for a grid over the whole frame (every
+    `step` pixels). Mapping any number of points is then a single NumPy
+    indexing operation. Without a homography it falls back to scaling the
+    frame onto the canvas.
+    """
+
+    def __init__(self, homography=None, frame_size=None, canvas_size=None, step=2):
+        self.step = step
+        self.canvas_size = canvas_size  # Canvas size the homography was measured on
+        self.lut = None
+        if homography is not None and frame_size:
+            width, height = frame_size
+            xs = np.arange(0, width + step, step, dtype=np.float32)
+            ys = np.arange(0, height + step, step, dtype=np.float32)
+            grid = np.stack(np.meshgrid(xs, ys), axis=-1)
+            self.lut = cv2.perspectiveTransform(grid.reshape(-1, 1, 2), np.asarray(homography, dtype=np.float64))
+            self.lut = self.lut.reshape(len(ys), len(xs), 2)
+
+    @classmethod
+    def from_profile(cls, profile):
+        if profile is None or profile.homography is None:
+            return cls()
+        return cls(profile.homography, profile.frame_size, profile.canvas_size)
+
+    def map(self, points, frame_size, canvas_size):
+        """Canvas (x, y) for an (N, 2) array of camera points, as an (N, 2) int array."""
+        points = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+        if self.lut is None:
+            scale = np.array(canvas_size, dtype=np.float32) / np.maximum(frame_size, 1)
+            return (points * scale).astype(int)
+        index = np.rint(points / self.step).astype(int)
+        ix = np.clip(index[:, 0], 0, self.lut.shape[1] - 1)
+        iy = np.clip(index[:, 1], 0, self.lut.shape[0] - 1)
+        mapped = self.lut[iy, ix]
+        if self.canvas_size and tuple(canvas_size) != tuple(self.canvas_size):
+            mapped = mapped * (np.array(canvas_size, dtype=np.float32) / self.canvas_size)  # Window was resized
+        return mapped.astype(int)
@@ -0,0 +1,149 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import cv2
+
+CACHE_FILE = ".camera_cache.json"
+CANDIDATES = (1, 0, 2, 3)  # In order of preference: external camera first, then the built-in webcam
+
+
+def probe_camera(index, abandoned=None):
+    """Opens one camera index and measures it.
+
+    Returns (info, cap) with the device still open, or (info, None) if it
+    could not be opened or delivered no frame. If `abandoned` is set by the
+    time the open finishes (the caller timed out), the device is released.
+    """
+    start = time.monotonic()
+    cap = cv2.VideoCapture(index)
+    ok = cap.isOpened() and cap.read()[0]
+    info = {
+        "index": index,
+        "ok": bool(ok),
+        "open_latency": time.monotonic() - start,
+        "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) if ok else 0,
+        "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) if ok else 0,
+        "fps": cap.get(cv2.CAP_PROP_FPS) if ok else 0.0,
+    }
+    if not ok or (abandoned is not None and abandoned.is_set()):
+        cap.release()
+        return info, None
+    return info, cap
+
+
+class CameraDiscovery:
+    """Finds a working camera on a background thread, so the UI never blocks on it.
+
+    The cached device from the last run is checked first. Only if it fails are
+    all candidate indices probed, concurrently and each with its own timeout.
+    The chosen device is handed over already opened through take().
+    """
+
+    def __init__(self, candidates=CANDIDATES, probe_timeout=5.0, retry_interval=5.0, cache_file=CACHE_FILE):
+        self.candidates = candidates
+        self.probe_timeout = probe_timeout
+        self.retry_interval = retry_interval
+        self.cache_file = cache_file
+
+        self.lock = threading.Lock()
+        self.thread = None
+        self.capture = None
+        self.devices = []        # Info of every probed device from the last full probe
+        self.chosen = None       # Info of the chosen device
+        self.last_attempt = None
+
+    @property
+    def searching(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        """Starts a background discovery unless one is already running."""
+        with self.lock:
+            if self.searching:
+                return
+            self.last_attempt = time.monotonic()
+            self.thread = threading.Thread(target=self._run, name="camera-discovery", daemon=True)
+            self.thread.start()
+
+    def take(self):
+        """Hands over the discovered, opened capture, or returns None if it isn't ready yet.
+
+        When nothing is ready and no search is running, a new search is started
+        (at most once per retry interval).
+        """
+        with self.lock:
+            cap, self.capture = self.capture, None
+        if cap is None and not self.searching:
+            if self.last_attempt is None or time.monotonic() - self.last_attempt >= self.retry_interval:
+                self.start()
+        return cap
+
+    def _run(self):
+        cached = self.load_cache()
+        if cached is not None:
+            info, cap = self._probe_with_timeout([cached["index"]])[0]
+            if cap is not None:
+                print(f"Using cached camera at index {cached['index']} ({info['open_latency']:.2f}s to open).")
+                self._deliver(info, cap)
+                return
+
+        results = self._probe_with_timeout(self.candidates)
+        self.devices = [info for info, _ in results]
+        chosen = None
+        for info, cap in results:  # Results follow the preference order
+            if cap is None:
+                continue
+            if chosen is None:
+                chosen = (info, cap)
+            else:
+                cap.release()
+
+        if chosen is None:
+            print("No camera found, will retry.")
+            return
+        info, cap = chosen
+        print(f"Camera found at index {info['index']}: {info['width']}x{info['height']} "
+              f"@ {info['fps']:.0f} FPS, opened in {info['open_latency']:.2f}s.")
+        self.save_cache(info)
+        self._deliver(info, cap)
+
+    def _probe_with_timeout(self, indices):
+        """Probes all indices at once. Returns (info, cap) pairs in the same order."""
+        abandoned = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=len(indices))
+        futures = [executor.submit(probe_camera, index, abandoned) for index in indices]
+        wait(futures, timeout=self.probe_timeout)
+        abandoned.set()  # Probes still hanging release their device whenever they finish
+        executor.shutdown(wait=False)
+
+        results = []
+        for index, future in zip(indices, futures):
+            if future.done() and future.exception() is None:
+                results.append(future.result())
+            else:
+                results.append(({"index": index, "ok": False, "open_latency": self.probe_timeout,
+                                 "width": 0, "height": 0, "fps": 0.0}, None))
+        return results
+
+    def _deliver(self, info, cap):
+        with self.lock:
+            if self.capture is not None:
+                self.capture.release()
+            self.chosen = info
+            self.capture = cap
+
+    def load_cache(self):
+        try:
+            with open(self.cache_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save_cache(self, info):
+        try:
+            with open(self.cache_file, "w") as f:
+                json.dump(info, f)
+        except OSError as e:
+            print(f"Warning: Could not write camera cache: {e}")
@@ -0,0 +1,50 @@
+class CameraSession:
+    """Keeps the capture device open across tab switches.
+
+    release() only pauses the session: the device stays open for
+    `grace_period` seconds, so coming back to the griddle view is instant.
+    It is closed for real when the grace period runs out or on close().
+    """
+
+    def __init__(self, root, open_camera, grace_period=60.0):
+        self.root = root
+        self.open_camera = open_camera  # Callable returning an opened cv2.VideoCapture, or None if not ready
+        self.grace_period = grace_period
+        self.cap = None
+        self.release_job = None
+
+    @property
+    def is_open(self):
+        return self.cap is not None and self.cap.isOpened()
+
+    def acquire(self):
+        """Returns the open device, reopening it only if it was really released.
+
+        Returns None while no device can be opened yet.
+        """
+        if self.release_job:
+            self.root.after_cancel(self.release_job)
+            self.release_job = None
+        if not self.is_open:
+            self.close()
+            self.cap = self.open_camera()
+        return self.cap
+
+    def release(self):
+        """Pauses the session and schedules the device to close after the grace period."""
+        if self.cap is None or self.release_job:
+            return
+        self.release_job = self.root.after(int(self.grace_period * 1000), self._expire)
+
+    def _expire(self):
+        self.release_job = None
+        self.close()
+
+    def close(self):
+        """Releases the device immediately."""
+        if self.release_job:
+            self.root.after_cancel(self.release_job)
+            self.release_job = None
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
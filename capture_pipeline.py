@@ -0,0 +1,165 @@
+import threading
+import time
+from collections import deque
+
+from perf_metrics import metrics
+
+
+class FPSCounter:
+    """Measures how often an event happens over a short sliding window."""
+
+    def __init__(self, window=30):
+        self.timestamps = deque(maxlen=window)
+        self.lock = threading.Lock()
+
+    def tick(self):
+        with self.lock:
+            self.timestamps.append(time.monotonic())
+
+    @property
+    def fps(self):
+        with self.lock:
+            if len(self.timestamps) < 2:
+                return 0.0
+            elapsed = self.timestamps[-1] - self.timestamps[0]
+            # A stalled stage should read as 0 FPS, not its last known rate
+            if elapsed <= 0 or time.monotonic() - self.timestamps[-1] > 1.0:
+                return 0.0
+            return (len(self.timestamps) - 1) / elapsed
+
+
+class LatestFrameQueue:
+    """Bounded queue where the newest frame wins and stale frames are dropped."""
+
+    def __init__(self, maxsize=1):
+        self.frames = deque(maxlen=maxsize)
+        self.condition = threading.Condition()
+        self.dropped = 0
+
+    def put(self, frame):
+        with self.condition:
+            if len(self.frames) == self.frames.maxlen:
+                self.dropped += 1  # deque(maxlen) pushes the oldest frame out
+            self.frames.append(frame)
+            self.condition.notify()
+
+    def get(self, timeout=None):
+        """Waits for a frame and returns the newest one, discarding anything older."""
+        with self.condition:
+            if not self.frames:
+                self.condition.wait(timeout)
+            return self._pop_latest()
+
+    def get_nowait(self):
+        with self.condition:
+            return self._pop_latest()
+
+    def _pop_latest(self):
+        if not self.frames:
+            return None
+        frame = self.frames.pop()
+        self.dropped += len(self.frames)
+        self.frames.clear()
+        return frame
+
+
+class CapturePipeline:
+    """Reads frames on a capture thread and processes them on a worker thread.
+
+    The Tk loop only calls latest_frame() and never blocks on the camera or
+    on detection. Capture, processing and display FPS are tracked separately.
+    """
+
+    def __init__(self, cap, process, queue_size=1):
+        self.cap = cap
+        self.process = process
+        self.raw_frames = LatestFrameQueue(queue_size)
+        self.processed_frames = LatestFrameQueue(queue_size)
+
+        self.capture_fps = FPSCounter()
+        self.processing_fps = FPSCounter()
+        self.display_fps = FPSCounter()
+
+        self.running = False
+        self.threads = []
+        self.last_capture_time = None  # perf_counter() when the last returned frame was captured
+        self.capture_interval = 0.0    # Minimum seconds between frames handed to processing
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.threads = [
+            threading.Thread(target=self._capture_loop, name="capture", daemon=True),
+            threading.Thread(target=self._process_loop, name="processing", daemon=True),
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def stop(self, timeout=1.0):
+        """Stops both threads. The capture device itself is left to the caller.
+
+        Returns False if a thread is still running after `timeout` (e.g. stuck
+        in a slow cap.read()), the device must not be read elsewhere until
+        `stopped` is True. Calling stop() again waits for it once more.
+        """
+        self.running = False
+        for thread in self.threads:
+            thread.join(timeout)
+        self.threads = [thread for thread in self.threads if thread.is_alive()]
+        return not self.threads
+
+    @property
+    def stopped(self):
+        self.threads = [thread for thread in self.threads if thread.is_alive()]
+        return not self.running and not self.threads
+
+    def _capture_loop(self):
+        forwarded = 0.0
+        while self.running:
+            with metrics.span("capture"):
+                ret, frame = self.cap.read()
+            if not ret:
+                time.sleep(0.01)  # Camera hiccup, don't spin
+                continue
+            self.capture_fps.tick()
+            # Keep draining the camera so frames stay fresh, but only forward them at the allowed rate
+            captured = time.perf_counter()
+            if captured - forwarded < self.capture_interval:
+                continue
+            forwarded = captured
+            self.raw_frames.put((captured, frame))
+
+    def _process_loop(self):
+        while self.running:
+            item = self.raw_frames.get(timeout=0.1)
+            if item is None:
+                continue
+            captured, frame = item
+            try:
+                result = self.process(frame)
+            except Exception as e:
+                print(f"Error in frame processing: {e}")
+                continue
+            self.processing_fps.tick()
+            self.processed_frames.put((captured, result))
+
+    def latest_frame(self):
+        """Returns the newest finished frame, or None if nothing new is ready."""
+        item = self.processed_frames.get_nowait()
+        if item is None:
+            return None
+        self.last_capture_time, result = item
+        return result
+
+    def mark_displayed(self):
+        self.display_fps.tick()
+
+    def stats(self):
+        return {
+            "capture_fps": self.capture_fps.fps,
+            "processing_fps": self.processing_fps.fps,
+            "display_fps": self.display_fps.fps,
+            "dropped_raw": self.raw_frames.dropped,
+            "dropped_processed": self.processed_frames.dropped,
+        }
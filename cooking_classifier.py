@@ -0,0 +1,78 @@
+import cv2
+import numpy as np
+
+HUE_BINS = 180          # OpenCV hue range is 0-179
+MIN_HUE = 10            # Hues at or below this are treated as dark/unusable pixels
+STATES = ("Raw", "Half", "Cooked")
+REFERENCE_IMAGES = ("patty_raw.png", "patty_half_cooked.png", "patty_ready.png")
+
+
+def hue_histograms(hue, labels, count):
+    """Hue histogram of every labeled region in one np.bincount pass.
+
+    `labels` is an int32 image where 0 is background and 1..count mark regions.
+    Returns a (count, HUE_BINS) array; row i belongs to label i + 1.
+    """
+    valid = (labels > 0) & (hue > MIN_HUE)
+    keys = labels[valid].astype(np.int64) * HUE_BINS + hue[valid]
+    counts = np.bincount(keys, minlength=(count + 1) * HUE_BINS)
+    return counts.reshape(count + 1, HUE_BINS)[1:]
+
+
+def histogram_medians(histograms):
+    """Median hue of each histogram row, or 0 for empty rows."""
+    cumulative = np.cumsum(histograms, axis=1)
+    totals = cumulative[:, -1]
+    medians = np.argmax(cumulative * 2 >= totals[:, None], axis=1)
+    return np.where(totals > 0, medians, 0)
+
+
+def dominant_hue(hsv_image):
+    """Median hue of the central region of an HSV image, ignoring dark pixels."""
+    h, w, _ = hsv_image.shape
+    labels = np.zeros((h, w), dtype=np.int32)
+    labels[h // 4:3 * h // 4, w // 4:3 * w // 4] = 1  # Center crop
+    return int(histogram_medians(hue_histograms(hsv_image[:, :, 0], labels, 1))[0])
+
+
+def box_contours(boxes):
+    """Elliptical contours inscribed in (x, y, w, h) boxes, for tracked patties without a fresh contour."""
+    return [cv2.ellipse2Poly((x + w // 2, y + h // 2), (max(1, w // 2), max(1, h // 2)), 0, 0, 360, 10)
+            for x, y, w, h in boxes]
+
+
+class CookingStateClassifier:
+    """Assigns Raw/Half/Cooked to every patty in a frame from its hue histogram.
+
+    The centroids are the dominant hues of the reference images. All patties in
+    a frame share one HSV conversion and one histogram pass.
+    """
+
+    def __init__(self, centroids, states=STATES):
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.states = states
+
+    def classify(self, frame, contours):
+        """Returns (state, median hue) for each contour, in order."""
+        if not contours:
+            return []
+
+        # Only convert the area that actually holds patties
+        points = np.concatenate([np.asarray(c).reshape(-1, 2) for c in contours])
+        x0, y0 = np.maximum(points.min(axis=0), 0)
+        x1, y1 = np.minimum(points.max(axis=0) + 1, (frame.shape[1], frame.shape[0]))
+        if x1 <= x0 or y1 <= y0:
+            return [(self.states[0], 0)] * len(contours)
+        hue = cv2.cvtColor(frame[y0:y1, x0:x1], cv2.COLOR_BGR2HSV)[:, :, 0]
+
+        labels = np.zeros(hue.shape, dtype=np.int32)
+        for index, contour in enumerate(contours):
+            shifted = np.asarray(contour).reshape(-1, 1, 2) - np.array([x0, y0])
+            cv2.drawContours(labels, [shifted.astype(np.int32)], -1, index + 1, thickness=cv2.FILLED)
+
+        medians = histogram_medians(hue_histograms(hue, labels, len(contours)))
+        # Hue is circular, so measure the shorter way around
+        distance = np.abs(medians[:, None] - self.centroids[None, :])
+        distance = np.minimum(distance, HUE_BINS - distance)
+        nearest = np.argmin(distance, axis=1)
+        return [(self.states[i], int(hue_value)) for i, hue_value in zip(nearest, medians)]
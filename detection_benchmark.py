@@ -0,0 +1,168 @@
+"""Offline throughput benchmark for the burger detection pipeline.
+
+Usage:
+    python detection_benchmark.py recording.mp4
+    python detection_benchmark.py frames_dir/ --repeat 5 --roi 100,80,900,600 --scale 0.5
+    python detection_benchmark.py recording.mp4 --segmentation lut
+    python detection_benchmark.py recording.mp4 --compare
+
+Runs the same steps as the live griddle view (flip, color conversion,
+threshold, mask refinement, connected components, drawing) headless and as
+fast as possible over a recording. It reports frames/sec, p50/p95/p99
+latency per stage and detection counts, so regressions can be caught on a
+machine without a camera or display.
+
+For the HSV path "convert" is cvtColor and "threshold" is inRange. For the
+lookup-table path they are the table index computation and the table lookup.
+--compare times both segmentation methods on the same frames and reports how
+often their masks agree.
+"""
+import argparse
+import itertools
+import time
+
+import cv2
+import numpy as np
+
+from burger_detector import BurgerDetector
+from frame_sources import open_source
+from reference_cache import load_reference_profile
+
+STAGES = ("read", "flip", "prepare", "convert", "threshold", "refine", "components", "drawing")
+
+
+def run_benchmark(source_spec, detector, repeat=1, limit=None):
+    """Runs the pipeline over the source `repeat` times. Returns the timings and counts."""
+    timings = {stage: [] for stage in STAGES}
+    counts = []
+    started = time.perf_counter()
+
+    for _ in range(repeat):
+        source = open_source(source_spec)
+        frames = 0
+        while limit is None or frames < limit:
+            t0 = time.perf_counter()
+            ret, frame = source.read()
+            if not ret:
+                break
+            t1 = time.perf_counter()
+            frame = cv2.flip(frame, 1)
+            t2 = time.perf_counter()
+            image, offset = detector.prepare(frame)
+            t3 = time.perf_counter()
+            if detector.color_table:
+                index = detector.color_table.index(image)
+                t4 = time.perf_counter()
+                mask = cv2.compare(detector.color_table.lookup(index), 0, cv2.CMP_GT)
+            else:
+                hsv = detector.to_hsv(image)
+                t4 = time.perf_counter()
+                mask = detector.threshold(hsv)
+            t5 = time.perf_counter()
+            mask = detector.refine(mask)
+            t6 = time.perf_counter()
+            boxes = detector.find_boxes(mask, offset)
+            t7 = time.perf_counter()
+            detector.draw(frame, boxes)
+            t8 = time.perf_counter()
+
+            marks = (t0, t1, t2, t3, t4, t5, t6, t7, t8)
+            for stage, start, end in zip(STAGES, marks, marks[1:]):
+                timings[stage].append(end - start)
+            counts.append(len(boxes))
+            frames += 1
+        source.release()
+
+    return {
+        'elapsed': time.perf_counter() - started,
+        'timings': {stage: np.array(values) for stage, values in timings.items()},
+        'counts': np.array(counts),
+    }
+
+
+def print_report(result):
+    counts = result['counts']
+    if not len(counts):
+        print("Error: No frames could be read.")
+        return
+    timings = result['timings']
+    processing = sum(timings[stage] for stage in STAGES if stage != "read")
+
+    print(f"{len(counts)} frames in {result['elapsed']:.2f}s: {len(counts) / result['elapsed']:.1f} FPS overall, "
+          f"{1 / processing.mean():.1f} FPS excluding decode")
+    print(f"{'stage':<16}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for stage, values in list(timings.items()) + [("total (no read)", processing)]:
+        p50, p95, p99 = np.percentile(values, [50, 95, 99]) * 1000
+        print(f"{stage:<16}{values.mean() * 1000:>10.3f}{p50:>10.3f}{p95:>10.3f}{p99:>10.3f}")
+    print(f"Detections: {counts.sum()} total, {counts.mean():.2f} per frame (min {counts.min()}, max {counts.max()})")
+
+
+def compare_segmentation(source_spec, detector_kwargs, limit=100):
+    """Times the HSV and lookup-table segmentation on the same prepared frames.
+
+    Returns {method: per-frame seconds} for the patty mask and the multi-class
+    segmentation of each method, plus the fraction of mask pixels that agree.
+    """
+    source = open_source(source_spec)
+    frames = list(itertools.islice(source, limit))
+    source.release()
+    hsv = BurgerDetector(segmentation="hsv", **detector_kwargs)
+    lut = BurgerDetector(segmentation="lut", **detector_kwargs)
+    images = [hsv.prepare(cv2.flip(frame, 1))[0] for frame in frames]
+    if not images:
+        return {'timings': {}, 'agreement': 0.0, 'frames': 0}
+
+    timings = {}
+    for name, run in (("hsv mask", hsv.mask), ("lut mask", lut.mask),
+                      ("hsv classes", hsv.segment), ("lut classes", lut.segment)):
+        run(images[0])  # Warm up
+        values = []
+        for image in images:
+            start = time.perf_counter()
+            run(image)
+            values.append(time.perf_counter() - start)
+        timings[name] = np.array(values)
+
+    agreement = np.mean([np.mean(hsv.mask(image) == lut.mask(image)) for image in images])
+    return {'timings': timings, 'agreement': agreement, 'frames': len(images)}
+
+
+def print_comparison(result):
+    if not result['frames']:
+        print("Error: No frames could be read.")
+        return
+    timings = result['timings']
+    print(f"Segmentation on {result['frames']} frames:")
+    print(f"{'method':<16}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, values in timings.items():
+        p50, p95 = np.percentile(values, [50, 95]) * 1000
+        print(f"{name:<16}{values.mean() * 1000:>10.3f}{p50:>10.3f}{p95:>10.3f}")
+    for kind in ("mask", "classes"):
+        speedup = timings[f"hsv {kind}"].mean() / timings[f"lut {kind}"].mean()
+        print(f"Lookup table vs HSV ({kind}): {speedup:.2f}x")
+    print(f"Mask agreement: {result['agreement'] * 100:.2f}% of pixels")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless burger detection throughput benchmark.")
+    parser.add_argument("source", help="Video file, directory of frames, or camera index")
+    parser.add_argument("--repeat", type=int, default=1, help="Passes over the recording")
+    parser.add_argument("--limit", type=int, help="Only use the first N frames of each pass")
+    parser.add_argument("--roi", help="Griddle region as x,y,w,h in camera pixels")
+    parser.add_argument("--scale", type=float, default=1.0, help="Detection scale factor")
+    parser.add_argument("--segmentation", choices=("hsv", "lut"), default="hsv", help="Color segmentation method")
+    parser.add_argument("--compare", action="store_true", help="Compare HSV and lookup-table segmentation")
+    args = parser.parse_args()
+
+    roi = tuple(int(v) for v in args.roi.split(",")) if args.roi else None
+    profile = load_reference_profile()
+    kwargs = {'roi': roi, 'scale': args.scale, 'class_hues': profile.hues if profile else None}
+    if args.compare:
+        print_comparison(compare_segmentation(args.source, kwargs, args.limit or 100))
+        return
+    detector = BurgerDetector(segmentation=args.segmentation, **kwargs)
+    print_report(run_benchmark(args.source, detector, args.repeat, args.limit))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Compares detection modes (full frame, griddle ROI, downscaled) on recorded frames.
+
+Usage:
+    python detection_report.py recording.mp4 --roi 100,80,900,600 --scales 1,0.5,0.25
+    python detection_report.py frames_dir/
+
+The full-resolution, full-frame mode is the reference. For every other mode the
+report shows latency and how many of the reference boxes it still finds.
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from burger_detector import BurgerDetector
+from frame_sources import open_source
+from patty_tracker import box_center, box_iou
+
+def load_frames(path, limit=None):
+    """Loads frames from a video file or a directory of images, mirrored like the live view."""
+    frames = []
+    source = open_source(path)
+    for frame in source:
+        if limit is not None and len(frames) >= limit:
+            break
+        frames.append(cv2.flip(frame, 1))
+    source.release()
+    return frames
+
+
+def match_boxes(reference, boxes, threshold=0.5):
+    """Greedily pairs boxes with reference boxes. Returns the number of matches."""
+    unmatched = list(boxes)
+    matches = 0
+    for ref in reference:
+        best = max(unmatched, key=lambda box: box_iou(ref, box), default=None)
+        if best is not None and box_iou(ref, best) >= threshold:
+            unmatched.remove(best)
+            matches += 1
+    return matches
+
+
+def inside(box, roi):
+    """True if the box center lies in the ROI."""
+    rx, ry, rw, rh = roi
+    cx, cy = box_center(box)
+    return rx <= cx < rx + rw and ry <= cy < ry + rh
+
+
+def run_mode(detector, frames):
+    """Returns the per-frame boxes and latencies (seconds) for one detector."""
+    results, latencies = [], []
+    for frame in frames:
+        start = time.perf_counter()
+        results.append(detector.detect(frame))
+        latencies.append(time.perf_counter() - start)
+    return results, np.array(latencies)
+
+
+def build_report(frames, roi=None, scales=(1.0, 0.5, 0.25)):
+    """Runs every mode over the frames and returns one row (dict) per mode."""
+    reference, ref_latency = run_mode(BurgerDetector(), frames)
+    rows = []
+    for use_roi in ([False, True] if roi else [False]):
+        for scale in scales:
+            detector = BurgerDetector(roi=roi if use_roi else None, scale=scale)
+            if not use_roi and scale == 1.0:
+                results, latency = reference, ref_latency
+            else:
+                results, latency = run_mode(detector, frames)
+
+            expected = found = detected = 0
+            for ref_boxes, boxes in zip(reference, results):
+                if use_roi:
+                    ref_boxes = [box for box in ref_boxes if inside(box, roi)]
+                expected += len(ref_boxes)
+                detected += len(boxes)
+                found += match_boxes(ref_boxes, boxes)
+
+            rows.append({
+                'mode': f"{'roi' if use_roi else 'full'} x{scale:g}",
+                'mean_ms': latency.mean() * 1000,
+                'p95_ms': np.percentile(latency, 95) * 1000,
+                'speedup': ref_latency.mean() / latency.mean(),
+                'recall': found / expected if expected else 1.0,
+                'precision': found / detected if detected else 1.0,
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Accuracy/latency report for burger detection modes.")
+    parser.add_argument("source", help="Video file or directory of recorded frames")
+    parser.add_argument("--roi", help="Griddle region as x,y,w,h in camera pixels")
+    parser.add_argument("--scales", default="1,0.5,0.25", help="Comma separated detection scale factors")
+    parser.add_argument("--limit", type=int, help="Only use the first N frames")
+    args = parser.parse_args()
+
+    frames = load_frames(args.source, args.limit)
+    if not frames:
+        print(f"Error: No frames could be read from {args.source}")
+        return
+    roi = tuple(int(v) for v in args.roi.split(",")) if args.roi else None
+    scales = [float(v) for v in args.scales.split(",")]
+
+    print(f"{len(frames)} frames of {frames[0].shape[1]}x{frames[0].shape[0]}")
+    print(f"{'mode':<12}{'mean ms':>10}{'p95 ms':>10}{'speedup':>10}{'recall':>10}{'precision':>11}")
+    for row in build_report(frames, roi, scales):
+        print(f"{row['mode']:<12}{row['mean_ms']:>10.2f}{row['p95_ms']:>10.2f}{row['speedup']:>9.1f}x"
+              f"{row['recall']:>10.2f}{row['precision']:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import time
+
+import cv2
+import numpy as np
+from PIL import Image, ImageTk
+
+from perf_metrics import metrics
+
+
+class DisplaySink:
+    """Shows BGR frames in a Tk label without allocating per frame.
+
+    One scaled buffer, one RGBA buffer (shared with a PIL image via frombuffer)
+    and one PhotoImage are kept and reused. Each frame is resized straight to
+    the label size, converted in place and pasted into the PhotoImage. They are
+    only reallocated when the label or frame size changes. Frames are skipped
+    while the label is not visible.
+    """
+
+    def __init__(self, label):
+        self.label = label
+        self.size = None
+        self.scaled = None
+        self.rgba = None
+        self.image = None
+        self.photo = None
+
+        self.shown = 0
+        self.skipped = 0
+        self.allocations = 0    # Buffer/PhotoImage (re)allocations since start
+        self.copy_time = 0.0    # Total seconds spent scaling, converting and pasting
+
+    def target_size(self, frame):
+        """Label size (width, height), keeping the frame's aspect ratio."""
+        frame_h, frame_w = frame.shape[:2]
+        width, height = self.label.winfo_width(), self.label.winfo_height()
+        if width <= 1 or height <= 1:  # Not laid out yet, show the frame as is
+            return frame_w, frame_h
+        ratio = min(width / frame_w, height / frame_h)
+        return max(1, int(frame_w * ratio)), max(1, int(frame_h * ratio))
+
+    def show(self, frame):
+        """Displays a BGR frame. Returns False if it was skipped."""
+        if not self.label.winfo_viewable():
+            self.skipped += 1
+            return False
+
+        start = time.perf_counter()
+        size = self.target_size(frame)
+        if size != self.size:
+            self._allocate(size)
+
+        with metrics.span("conversion"):
+            if (frame.shape[1], frame.shape[0]) == size:
+                cv2.cvtColor(frame, cv2.COLOR_BGR2RGBA, dst=self.rgba)
+            else:
+                cv2.resize(frame, size, dst=self.scaled, interpolation=cv2.INTER_LINEAR)
+                cv2.cvtColor(self.scaled, cv2.COLOR_BGR2RGBA, dst=self.rgba)
+        with metrics.span("tk_update"):
+            self.photo.paste(self.image)  # The PIL image is a view of self.rgba, no extra copy
+        self.copy_time += time.perf_counter() - start
+        self.shown += 1
+        return True
+
+    def _allocate(self, size):
+        width, height = size
+        self.scaled = np.empty((height, width, 3), dtype=np.uint8)
+        self.rgba = np.empty((height, width, 4), dtype=np.uint8)
+        self.image = Image.frombuffer("RGBA", size, self.rgba, "raw", "RGBA", 0, 1)
+        self.photo = ImageTk.PhotoImage("RGBA", size)
+        self.label.config(image=self.photo)
+        self.label.image = self.photo
+        self.size = size
+        self.allocations += 1
+
+    def stats(self):
+        return {
+            "shown": self.shown,
+            "skipped": self.skipped,
+            "allocations": self.allocations,
+            "copy_ms": self.copy_time / self.shown * 1000 if self.shown else 0.0,
+        }
@@ -0,0 +1,72 @@
+from perf_metrics import metrics
+
+
+class FrameGovernor:
+    """Keeps Tk event-loop lag under a budget by trading away video smoothness.
+
+    Every update() reads the recent Tk lag, display cost and full-detection
+    time (PattyTracker's "full_detection" span) from the shared metrics and adjusts three knobs:
+
+    - `interval_ms`: how often the Tk loop polls for and shows a new frame
+    - `capture_interval`: seconds between frames handed to processing
+    - `stride`: frames per full detection (PattyTracker.detect_every)
+
+    Over budget it backs off multiplicatively, well under budget it recovers
+    one step at a time, so the video never oscillates between extremes.
+    Patty timers always win: should_defer() tells the video loop to skip a
+    frame whenever a timer or blink is due before the frame could finish.
+    """
+
+    def __init__(self, lag_budget_ms=25, min_interval_ms=10, max_interval_ms=200,
+                 stride=5, max_stride=15, source=metrics):
+        self.lag_budget_ms = lag_budget_ms
+        self.min_interval_ms = min_interval_ms
+        self.max_interval_ms = max_interval_ms
+        self.min_stride = stride
+        self.max_stride = max_stride
+        self.source = source
+
+        self.interval_ms = min_interval_ms
+        self.stride = stride
+        self.frame_cost_ms = 0.0  # Recent cost of showing one frame on the Tk thread
+        self.deferred = 0
+
+    @property
+    def capture_interval(self):
+        """Seconds between processed frames: no point detecting frames that will never be shown."""
+        return 0.0 if self.interval_ms <= self.min_interval_ms else self.interval_ms / 1000
+
+    def update(self):
+        """Re-evaluates the knobs from the latest measurements. Returns True if anything changed."""
+        lag = self.source.percentile_ms("tk_lag", 95, last=10)
+        self.frame_cost_ms = (self.source.percentile_ms("conversion", 50, last=30)
+                              + self.source.percentile_ms("tk_update", 50, last=30))
+        detection_ms = self.source.percentile_ms("full_detection", 50, last=10)
+        before = (self.interval_ms, self.stride)
+
+        if lag > self.lag_budget_ms:
+            self.interval_ms = min(self.max_interval_ms, int(self.interval_ms * 1.5) + 1)
+            self.stride = min(self.max_stride, self.stride + 1)
+        elif lag < self.lag_budget_ms / 2:
+            if self.interval_ms > self.min_interval_ms:
+                self.interval_ms = max(self.min_interval_ms, self.interval_ms - 5)
+            elif self.stride > self.min_stride:
+                self.stride -= 1  # Restore detection last, once the video is back to full rate
+
+        # Never poll faster than a frame takes to show, leave the rest of the loop to timers
+        self.interval_ms = max(self.interval_ms, min(self.max_interval_ms, int(self.frame_cost_ms * 2)))
+        # Detecting slower than frames arrive only queues stale work, spread it over more frames
+        if detection_ms > self.interval_ms * self.stride:
+            self.stride = min(self.max_stride, self.stride + 1)
+
+        self.source.set_gauge("video_interval_ms", self.interval_ms)
+        self.source.set_gauge("detection_stride", self.stride)
+        self.source.set_gauge("frames_deferred", self.deferred)
+        return (self.interval_ms, self.stride) != before
+
+    def should_defer(self, next_timer_delay):
+        """True if a timer event (due in `next_timer_delay` seconds, or None) should run before the next frame."""
+        if next_timer_delay is None or next_timer_delay * 1000 > self.frame_cost_ms + 2:
+            return False
+        self.deferred += 1
+        return True
@@ -0,0 +1,111 @@
+import os
+import time
+from abc import ABC, abstractmethod
+
+import cv2
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+class FrameSource(ABC):
+    """Common interface for anything that yields BGR frames.
+
+    Matches the parts of cv2.VideoCapture the app uses (read, isOpened,
+    release), so a source can be handed to CapturePipeline in place of a
+    camera. Iterating yields frames until the source runs out.
+    """
+
+    @abstractmethod
+    def read(self):
+        """Returns (ret, frame) like cv2.VideoCapture.read."""
+
+    def isOpened(self):
+        return True
+
+    def release(self):
+        pass
+
+    def __iter__(self):
+        while True:
+            ret, frame = self.read()
+            if not ret:
+                return
+            yield frame
+
+
+class LiveCameraSource(FrameSource):
+    def __init__(self, index):
+        self.cap = cv2.VideoCapture(index)
+
+    def read(self):
+        return self.cap.read()
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+
+class VideoFileSource(FrameSource):
+    """Frames from a recording. With `realtime`, reads are paced to the file's FPS."""
+
+    def __init__(self, path, loop=False, realtime=False):
+        self.path = path
+        self.loop = loop
+        self.cap = cv2.VideoCapture(path)
+        fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.interval = 1.0 / fps if realtime and fps > 0 else 0.0
+        self.next_time = None
+
+    def read(self):
+        if self.interval:
+            now = time.monotonic()
+            if self.next_time is not None and now < self.next_time:
+                time.sleep(self.next_time - now)
+            self.next_time = max(now, self.next_time or now) + self.interval
+        ret, frame = self.cap.read()
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        return ret, frame
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+
+class ImageDirectorySource(FrameSource):
+    """Frames from the images in a directory, in file name order."""
+
+    def __init__(self, path, loop=False):
+        self.paths = [os.path.join(path, name) for name in sorted(os.listdir(path))
+                      if name.lower().endswith(IMAGE_EXTENSIONS)]
+        self.loop = loop
+        self.position = 0
+
+    def read(self):
+        while self.position < len(self.paths) or (self.loop and self.paths):
+            if self.position >= len(self.paths):
+                self.position = 0
+            frame = cv2.imread(self.paths[self.position])
+            if frame is not None:
+                self.position += 1
+                return True, frame
+            print(f"Warning: Skipping unreadable image {self.paths[self.position]}")
+            del self.paths[self.position]  # So a loop over nothing but unreadable files ends
+        return False, None
+
+    def isOpened(self):
+        return bool(self.paths)
+
+
+def open_source(spec, loop=False, realtime=False):
+    """Opens a camera index ("0", "1"), an image directory or a video file."""
+    if isinstance(spec, int) or str(spec).isdigit():
+        return LiveCameraSource(int(spec))
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec, loop=loop)
+    return VideoFileSource(spec, loop=loop, realtime=realtime)
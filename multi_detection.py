@@ -0,0 +1,284 @@
+"""Process-pool burger detection across several cameras or griddle tiles.
+
+Every zone (one camera, or one tile of a wide-angle frame) has its own worker
+process and its own shared-memory ring of frame slots. The parent copies each
+frame (or tile) into a free slot once and sends only the slot number, so no
+frame is ever pickled. Workers run BurgerDetector outside the parent's GIL.
+Results from all zones are merged into one GriddleModel.
+
+Usage (headless throughput check):
+    python multi_detection.py recording.mp4 --tiles 2x2
+    python multi_detection.py cam_left.mp4 cam_right.mp4 --frames 200
+"""
+import argparse
+import itertools
+import multiprocessing as mp
+import queue
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from burger_detector import BurgerDetector
+
+
+class FrameRing:
+    """A fixed number of same-shaped uint8 frame slots in shared memory."""
+
+    def __init__(self, shape, slots, name=None):
+        self.shape = tuple(shape)
+        self.slots = slots
+        size = int(np.prod(self.shape)) * slots
+        self.shm = shared_memory.SharedMemory(name=name, create=name is None, size=size)
+        self.frames = np.ndarray((slots,) + self.shape, dtype=np.uint8, buffer=self.shm.buf)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def close(self):
+        self.frames = None  # Drop the view before closing the buffer
+        self.shm.close()
+
+    def unlink(self):
+        self.shm.unlink()
+
+
+def detection_worker(shm_name, shape, slots, tasks, results, zone_id, detector_kwargs):
+    """Worker process: detects burgers in ring slots named by the task queue."""
+    ring = FrameRing(shape, slots, name=shm_name)  # Spawned workers share the parent's resource tracker
+    detector = BurgerDetector(**detector_kwargs)
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        slot, seq = task
+        results.put((zone_id, seq, slot, detector.detect(ring.frames[slot])))
+    ring.close()
+
+
+def tile_rects(width, height, cols, rows, overlap):
+    """Splits a frame into cols x rows tiles that overlap by `overlap` pixels."""
+    rects = []
+    for row in range(rows):
+        for col in range(cols):
+            x0 = max(0, col * width // cols - overlap // 2)
+            y0 = max(0, row * height // rows - overlap // 2)
+            x1 = min(width, (col + 1) * width // cols + overlap // 2)
+            y1 = min(height, (row + 1) * height // rows + overlap // 2)
+            rects.append((x0, y0, x1 - x0, y1 - y0))
+    return rects
+
+
+def intersection(a, b):
+    w = min(a[0] + a[2], b[0] + b[2]) - max(a[0], b[0])
+    h = min(a[1] + a[3], b[1] + b[3]) - max(a[1], b[1])
+    return w * h if w > 0 and h > 0 else 0
+
+
+def merge_boxes(boxes, threshold=0.5):
+    """Drops boxes that mostly lie inside a larger one (the same patty seen by two tiles)."""
+    kept = []
+    for box in sorted(boxes, key=lambda b: b[2] * b[3], reverse=True):
+        area = max(1, box[2] * box[3])
+        if all(intersection(box, other) / area < threshold for other in kept):
+            kept.append(box)
+    return kept
+
+
+class GriddleModel:
+    """Latest detections of every feed, placed in one shared griddle coordinate space."""
+
+    def __init__(self, offsets):
+        self.offsets = offsets  # Feed -> (x, y) of that camera's frame on the griddle
+        self.feed_boxes = {feed: [] for feed in offsets}
+
+    def update(self, feed, boxes):
+        ox, oy = self.offsets[feed]
+        self.feed_boxes[feed] = [(x + ox, y + oy, w, h) for x, y, w, h in boxes]
+
+    def boxes(self):
+        """All current boxes in griddle coordinates, de-duplicated where cameras overlap."""
+        return merge_boxes([box for boxes in self.feed_boxes.values() for box in boxes])
+
+
+class Zone:
+    def __init__(self, zone_id, feed, rect, ring, tasks, process):
+        self.id = zone_id
+        self.feed = feed
+        self.rect = rect          # (x, y, w, h) of this zone inside the feed's frame
+        self.ring = ring
+        self.tasks = tasks
+        self.process = process
+        self.free = list(range(ring.slots))
+
+
+class MultiDetector:
+    """Runs detection for several feeds, each split into tiles, on a pool of processes.
+
+    `frame_shapes` lists the (height, width, 3) shape of every feed. `offsets`
+    places each feed on the griddle (defaults to side by side).
+    """
+
+    def __init__(self, frame_shapes, tiles=(1, 1), overlap=160, slots=4, offsets=None, detector_kwargs=None):
+        if offsets is None:
+            offsets, x = [], 0
+            for shape in frame_shapes:
+                offsets.append((x, 0))
+                x += shape[1]
+        self.frame_shapes = [tuple(shape) for shape in frame_shapes]
+        self.model = GriddleModel(dict(enumerate(offsets)))
+        # Spawn, not fork: forking a process that already runs Tk and threads is unsafe
+        context = mp.get_context("spawn")
+        self.results = context.Queue()
+        self.zones = []
+        self.pending = {}  # (feed, seq) -> [zones still working, collected boxes]
+        self.seq = itertools.count()
+        self.dropped = 0
+
+        for feed, shape in enumerate(self.frame_shapes):
+            cols, rows = tiles
+            for rect in tile_rects(shape[1], shape[0], cols, rows, overlap):
+                zone_id = len(self.zones)
+                ring = FrameRing((rect[3], rect[2], 3), slots)
+                tasks = context.Queue()
+                process = context.Process(target=detection_worker, daemon=True,
+                                          args=(ring.name, ring.shape, slots, tasks, self.results, zone_id,
+                                                detector_kwargs or {}))
+                process.start()
+                self.zones.append(Zone(zone_id, feed, rect, ring, tasks, process))
+
+    @property
+    def in_flight(self):
+        return len(self.pending)
+
+    def submit(self, feed, frame):
+        """Copies the frame into every zone of the feed. Returns the sequence number, or None if dropped."""
+        zones = [zone for zone in self.zones if zone.feed == feed]
+        if any(not zone.free for zone in zones):
+            self.dropped += 1  # Workers are behind, skip this frame rather than queue it
+            return None
+        seq = next(self.seq)
+        for zone in zones:
+            x, y, w, h = zone.rect
+            slot = zone.free.pop()
+            np.copyto(zone.ring.frames[slot], frame[y:y + h, x:x + w])
+            zone.tasks.put((slot, seq))
+        self.pending[(feed, seq)] = [len(zones), []]
+        return seq
+
+    def poll(self, timeout=0.0):
+        """Collects worker results. Returns [(feed, seq, boxes)] for every completed frame."""
+        completed = []
+        block = timeout > 0
+        while True:
+            try:
+                zone_id, seq, slot, boxes = self.results.get(block, timeout)
+            except queue.Empty:
+                return completed
+            block = False  # Only wait for the first result
+            zone = self.zones[zone_id]
+            zone.free.append(slot)
+            x, y, _, _ = zone.rect
+            entry = self.pending[(zone.feed, seq)]
+            entry[0] -= 1
+            entry[1].extend((bx + x, by + y, bw, bh) for bx, by, bw, bh in boxes)
+            if entry[0] == 0:
+                del self.pending[(zone.feed, seq)]
+                merged = merge_boxes(entry[1])
+                self.model.update(zone.feed, merged)
+                completed.append((zone.feed, seq, merged))
+
+    def check_workers(self):
+        """Raises RuntimeError if a worker process has exited (e.g. it crashed in detect())."""
+        for zone in self.zones:
+            if not zone.process.is_alive():
+                raise RuntimeError(f"Detection worker for zone {zone.id} exited with code {zone.process.exitcode}")
+
+    def detect(self, frame, feed=0, timeout=5.0):
+        """Synchronous helper: detects one frame on the pool and returns its boxes (feed coordinates).
+
+        Raises RuntimeError if a worker died or no result arrived within `timeout` seconds.
+        """
+        deadline = time.monotonic() + timeout
+        seq = self.submit(feed, frame)
+        while seq is None:
+            self._wait(deadline)
+            seq = self.submit(feed, frame)
+        while True:
+            for done_feed, done_seq, boxes in self._wait(deadline):
+                if (done_feed, done_seq) == (feed, seq):
+                    return boxes
+
+    def _wait(self, deadline):
+        completed = self.poll(timeout=0.1)
+        if not completed:
+            self.check_workers()
+            if time.monotonic() > deadline:
+                raise RuntimeError("Detection workers did not answer in time")
+        return completed
+
+    def close(self):
+        for zone in self.zones:
+            zone.tasks.put(None)
+        for zone in self.zones:
+            zone.process.join(timeout=2)
+            if zone.process.is_alive():
+                zone.process.terminate()
+            zone.ring.close()
+            zone.ring.unlink()
+        self.zones = []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-process burger detection throughput check.")
+    parser.add_argument("sources", nargs="+", help="One video file or frame directory per camera")
+    parser.add_argument("--tiles", default="1x1", help="Tiles per camera as COLSxROWS")
+    parser.add_argument("--frames", type=int, default=100, help="Frames to load from each source")
+    args = parser.parse_args()
+
+    from frame_sources import open_source
+
+    feeds = []
+    for spec in args.sources:
+        source = open_source(spec)
+        frames = list(itertools.islice(source, args.frames))
+        source.release()
+        if not frames:
+            print(f"Error: No frames could be read from {spec}")
+            return
+        feeds.append(frames)
+    total = sum(len(frames) for frames in feeds)
+
+    detector = BurgerDetector()
+    start = time.perf_counter()
+    for frames in feeds:
+        for frame in frames:
+            detector.detect(frame)
+    inline = time.perf_counter() - start
+
+    cols, rows = (int(v) for v in args.tiles.lower().split("x"))
+    multi = MultiDetector([frames[0].shape for frames in feeds], tiles=(cols, rows))
+    multi.detect(feeds[0][0])  # Warm up the workers
+    start = time.perf_counter()
+    done = 0
+    for index in range(max(len(frames) for frames in feeds)):
+        for feed, frames in enumerate(feeds):
+            if index < len(frames):
+                while multi.submit(feed, frames[index]) is None:
+                    done += len(multi.poll(timeout=0.1))
+        done += len(multi.poll())
+    while multi.in_flight:
+        done += len(multi.poll(timeout=0.1))
+    pooled = time.perf_counter() - start
+    multi.close()
+
+    print(f"{len(feeds)} feed(s), {len(multi.model.offsets)} on the griddle, {cols}x{rows} tiles each, "
+          f"{mp.cpu_count()} cores")
+    print(f"Inline:        {total / inline:8.1f} frames/s")
+    print(f"Process pool:  {done / pooled:8.1f} frames/s ({multi.dropped} submissions waited for a free slot)")
+    print(f"Griddle model: {len(multi.model.boxes())} patties in the latest frames")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,39 @@ import tkinter as tk
 from screeninfo import get_monitors
 import cv2
 from PIL import Image, ImageTk
-import numpy as np
+import queue
+import sys
+import threading
+import time
+from burger_detector import BurgerDetector
+from calibration import (CalibrationProfile, CoordinateMapper, checkerboard_squares, find_checkerboard, fit_colors,
+                         fit_homography, load_calibration, save_calibration)
+from camera_discovery import CameraDiscovery
+from camera_session import CameraSession
+from capture_pipeline import CapturePipeline
+from cooking_classifier import CookingStateClassifier, box_contours
+from display_sink import DisplaySink
+from frame_governor import FrameGovernor
+from frame_sources import open_source
+from multi_detection import MultiDetector
+from patty_engine import CanvasRenderer, PattySimulation, TkTimers
+from patty_log import PattyLog
+from patty_tracker import PattyTracker
+from perf_metrics import MetricsExporter, TkLagMonitor, metrics
+from reference_cache import load_reference_profile
+
+GRIDDLE_ROI = None      # (x, y, w, h) of the griddle in camera pixels, None for the whole frame
+DETECTION_SCALE = 1.0   # Run detection on a downscaled frame, e.g. 0.5 for half resolution
+DETECT_EVERY = 5        # Full detection every K frames, cheap tracking in between
+TRACKED_PATTY_TIME = 30 # Timer (seconds) for patties created from camera tracks
+DETECTION_TILES = None  # (cols, rows) to split each frame across worker processes, None to detect inline
+CAMERA_GRACE_PERIOD = 60  # Seconds the camera stays open (paused) after leaving the griddle view
+SHOW_PERF_HUD = False   # Start with the performance overlay visible (toggle with F3)
+METRICS_EXPORT_INTERVAL = 10  # Seconds between metrics.jsonl/metrics.prom exports, None to disable
+TK_LAG_BUDGET_MS = 25   # The video backs off (frame rate, then detection) when Tk lags more than this
 
 class CookingApp:
-    def __init__(self, root):
+    def __init__(self, root, source=None):
         self.root = root
         self.root.title("Main Window")
 
@@ -26,28 +55,76 @@ class CookingApp:
         # Track window resizing
         self.root.bind("<Configure>", self.update_sidebar_font)
 
+        # Patty timers, blinks and drawing run in a Tk-free engine on one Tk timer.
+        # Every patty event is logged, and patties still cooking at the last exit or crash come back.
+        self.patty_log = PattyLog(timers=TkTimers(self.root))
+        self.simulation = PattySimulation(TkTimers(self.root), on_removed=self.on_patty_removed, log=self.patty_log)
+        restored = [self.simulation.add(patty['x'], patty['y'], patty['remaining'], cooked=patty['cooked'])
+                    for patty in self.patty_log.restore()]
+
         # Open Simulated View if a second monitor exists
-        self.patties = []  # Store patties for simulation
         self.simulated_window = None
         if self.secondary_monitor:
             self.open_simulated_view()
 
+        # Saved color bounds and camera-to-simulated-view mapping, if the Calibration tab was used
+        self.calibration = load_calibration() or CalibrationProfile()
+        self.mapper = CoordinateMapper.from_profile(self.calibration)
+
         # Initialize webcam
+        self.detector = BurgerDetector(roi=GRIDDLE_ROI, scale=DETECTION_SCALE)
+        if self.calibration.lower:
+            self.detector.set_bounds(self.calibration.lower, self.calibration.upper)
+        self.multi_detector = None  # Created on the first frame when DETECTION_TILES is set
+        self.detection_pool_failed = False  # A worker died, detection fell back to inline
+        self.multi_detector_stale = False  # Set when the color bounds change, the workers are then rebuilt
+        # The tracker runs on the processing thread, its events are applied on the Tk thread
+        self.track_events = queue.SimpleQueue()
+        self.tracker = PattyTracker(detect_every=DETECT_EVERY,
+                                    on_new=lambda track: self.queue_track_event("new", track),
+                                    on_update=lambda track: self.queue_track_event("update", track),
+                                    on_lost=lambda track: self.queue_track_event("lost", track))
+        profile = load_reference_profile()
+        self.classifier = CookingStateClassifier(profile.hues) if profile else None
+        if not profile:
+            print("Error: One or more reference images not found, cooking states disabled.")
+        self.burger_thumbnail = None
+        self.burger_thumbnail_signature = None
+        self.frame_size = (1, 1)
+        self.track_patties = {}  # Track ID -> patty ID
+        self.patty_tracks = {}   # Patty ID -> track ID
+        # Patties whose track was lost, waiting to be picked up again. Restored patties have no track yet either.
+        self.lost_patties = set(restored)
+        if source is not None:
+            # Replay a recording (or a fixed camera index) instead of discovering a camera
+            open_camera = lambda: open_source(source, loop=True, realtime=True)
+        else:
+            # Discovery starts right away in the background, checking the cached device first
+            self.camera_discovery = CameraDiscovery()
+            self.camera_discovery.start()
+            open_camera = self.camera_discovery.take
+        self.camera = CameraSession(self.root, open_camera, CAMERA_GRACE_PERIOD)
         self.cap = None
-        self.video_label = None
-
-    def find_camera(self):
-        """Attempts to find an external camera, falls back to default webcam if not found."""
-        """Only used with secondary camera find method"""
-        for i in range(1, 2):  # Check for external cameras at indices 1, 2, 3, etc.
-            cap = cv2.VideoCapture(i)
-            if cap.isOpened():
-                print(f"External camera found at index {i}.")
-                return cap
-            cap.release()
-        print("No external camera found, falling back to default webcam at index 0.")
-        cap = cv2.VideoCapture(0)  # Fallback to default webcam
-        return cap
+        self.pipeline = None
+        self.webcam_job = None
+        self.calibration_reader = None  # Thread reading calibration frames, the pipeline waits for it
+        self.stopping_pipeline = None   # Stopped pipeline whose capture thread hasn't returned from a read yet
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        # Performance HUD and metrics export
+        self.hud_label = tk.Label(self.root, text="", font=("Consolas", 11), fg="lime", bg="black", justify="left")
+        self.hud_visible = False
+        if SHOW_PERF_HUD:
+            self.toggle_hud()
+        self.root.bind("<F3>", self.toggle_hud)
+        self.lag_monitor = TkLagMonitor(self.root)
+        self.lag_monitor.start()
+        self.governor = FrameGovernor(lag_budget_ms=TK_LAG_BUDGET_MS, stride=DETECT_EVERY)
+        self.metrics_exporter = None
+        if METRICS_EXPORT_INTERVAL:
+            self.metrics_exporter = MetricsExporter(self.root, interval=METRICS_EXPORT_INTERVAL)
+            self.metrics_exporter.start()
+        self.update_metrics()
 
     def create_sidebar(self):
         """Creates a sidebar menu that adjusts based on window size."""
@@ -76,13 +153,13 @@ class CookingApp:
         self.main_content = tk.Frame(self.root, bg="gray25")
         self.main_content.pack(side="right", fill="both", expand=True)
 
+        self.screens = {}  # Title -> Frame, built on first visit and then only hidden/shown
         self.current_screen = None
         self.show_main_menu()
     
     def switch_tab(self, command):
         """Switches tabs and ensures the webcam is properly released when needed."""
-        if self.cap:
-            self.close_webcam()
+        self.close_webcam()
         command()
 
     def update_sidebar_font(self, event=None):
@@ -93,123 +170,398 @@ class CookingApp:
         for button in self.menu_buttons:
             button.config(font=("Arial", font_size))
 
-    def switch_screen(self, text):
+    def switch_screen(self, text, build=None):
+        """Shows the screen titled `text`, building it with `build(screen)` on first use."""
         if self.current_screen:
-            self.current_screen.destroy()
-        self.current_screen = tk.Frame(self.main_content, bg="gray25")
+            self.current_screen.pack_forget()
+        if text not in self.screens:
+            screen = tk.Frame(self.main_content, bg="gray25")
+            (build or self.add_screen_title)(screen, text)
+            self.screens[text] = screen
+        self.current_screen = self.screens[text]
         self.current_screen.pack(fill="both", expand=True)
-        label = tk.Label(self.current_screen, text=text, font=("Arial", 18), fg="white", bg="gray25")
+
+    def add_screen_title(self, screen, text):
+        label = tk.Label(screen, text=text, font=("Arial", 18), fg="white", bg="gray25")
         label.pack(pady=100)
 
 
     def show_main_menu(self): self.switch_screen("🏠 Main Menu")
     def show_settings(self): self.switch_screen("⚙️ Settings")
-    def show_calibration(self): self.switch_screen("🔧 Calibration")
-    def show_coordinate_testing(self): self.setup_coordinate_testing()
+    def show_calibration(self): self.switch_screen("🔧 Calibration", self.build_calibration)
+    def show_coordinate_testing(self): self.switch_screen("Coordinate Testing", self.setup_coordinate_testing)
 
     def show_griddle_view(self):
         """Displays the live video feed and applies color-based burger detection."""
-        self.switch_screen("📷 Webcam/Griddle View")
-        self.video_label = tk.Label(self.current_screen)
-        self.video_label.pack()
-        
-        #self.cap = self.find_camera()  # Use the method to find the correct camera (secondary method)
-        self.cap = cv2.VideoCapture(1)  # Default method (0 for pc's webcam, 1 for external camera)
-
-        if not self.cap.isOpened():  # Check if the camera opened successfully
-            print("External camera not found. Falling back to default webcam at index 0.")
-            self.cap = cv2.VideoCapture(0)  # Fallback to the built-in webcam (index 0)
+        self.switch_screen("📷 Webcam/Griddle View", self.build_griddle_view)
+        self.start_webcam()
+
+    def start_webcam(self):
+        """Starts the feed once a camera is available, checking back until discovery finds one."""
+        if self.camera_busy():
+            # A calibration or the last pipeline is still reading the device, start once it is done with it
+            self.fps_label.config(text="Waiting for the camera...")
+            self.webcam_job = self.root.after(200, self.start_webcam)
+            return
+        # The session keeps the device open between visits, so this is instant after the first time
+        self.cap = self.camera.acquire()
+        if self.cap is None:
+            self.fps_label.config(text="Searching for camera...")
+            self.webcam_job = self.root.after(200, self.start_webcam)
+            return
 
+        # Camera reads and detection run off the Tk thread, the UI only blits results
+        self.pipeline = CapturePipeline(self.cap, self.process_frame)
+        self.pipeline.capture_interval = self.governor.capture_interval
+        self.pipeline.start()
         self.update_webcam_feed()
-        
+
+    def build_griddle_view(self, screen, text):
+        self.add_screen_title(screen, text)
+        self.fps_label = tk.Label(screen, text="", font=("Arial", 12), fg="white", bg="gray25")
+        self.fps_label.pack(side="bottom", pady=5)
+        self.video_label = tk.Label(screen, bg="gray25")
+        self.video_label.pack(fill="both", expand=True)
+        self.display_sink = DisplaySink(self.video_label)  # Frames are scaled to the label size
 
     def show_burger_vision(self): 
         """Displays Burger Vision analysis in the main window."""
+        self.switch_screen("🍔 Burger Vision Analysis", self.build_burger_vision)
 
-        self.switch_screen("🍔 Burger Vision Analysis")
-        
-        self.image_label = tk.Label(self.current_screen, bg="gray25")
+        # Both are served from the reference cache unless an image changed on disk
+        self.analyze_burger_images()
+        self.update_burger_image()
+
+    def build_burger_vision(self, screen, text):
+        self.add_screen_title(screen, text)
+
+        self.image_label = tk.Label(screen, bg="gray25")
         self.image_label.pack()
         
-        self.analysis_label = tk.Label(self.current_screen, text="", font=("Arial", 14), fg="white", bg="gray25")
+        self.analysis_label = tk.Label(screen, text="", font=("Arial", 14), fg="white", bg="gray25")
         self.analysis_label.pack(pady=10)
 
-        self.color_display = tk.Canvas(self.current_screen, width=300, height=50, bg="gray25", highlightthickness=0)
+        self.color_display = tk.Canvas(screen, width=300, height=50, bg="gray25", highlightthickness=0)
         self.color_display.pack(pady=5)
-        
-        self.analyze_burger_images()
-        self.update_burger_image()
+
+    def process_frame(self, frame):
+        """Runs on the processing thread: mirrors the frame and detects burgers."""
+        frame = cv2.flip(frame, 1)  # Flip horizontally for natural mirroring
+        with metrics.span("detection"):
+            return self.detect_burgers(frame)  # Apply burger detection
 
     def update_webcam_feed(self):
-        """Captures video frames, applies burger detection, and updates the Tkinter UI."""
-        if self.cap:
-            ret, frame = self.cap.read()
-            if ret:
-                frame = cv2.flip(frame, 1)  # Flip horizontally for natural mirroring
-                processed_frame = self.detect_burgers(frame)  # Apply burger detection
-                img = cv2.cvtColor(processed_frame, cv2.COLOR_BGR2RGB)
-                img = Image.fromarray(img)
-                img = ImageTk.PhotoImage(img)
-                
-                self.video_label.config(image=img)
-                self.video_label.image = img
-                
-            self.current_screen.after(10, self.update_webcam_feed)  # Refresh at ~60 FPS
+        """Shows the newest processed frame from the capture pipeline in the Tkinter UI."""
+        if self.pipeline:
+            self.apply_track_events()
+            if self.governor.should_defer(self.simulation.next_event_delay()):
+                # A patty timer is about to fire, let it run on time and show the next frame instead
+                self.webcam_job = self.root.after(self.governor.interval_ms, self.update_webcam_feed)
+                return
+            frame = self.pipeline.latest_frame()
+            if frame is not None and self.display_sink.show(frame):
+                self.pipeline.mark_displayed()
+                metrics.record("frame_latency", time.perf_counter() - self.pipeline.last_capture_time)
+
+                stats = self.pipeline.stats()
+                sink = self.display_sink.stats()
+                self.fps_label.config(text=f"Capture {stats['capture_fps']:.1f} FPS | "
+                                           f"Processing {stats['processing_fps']:.1f} FPS | "
+                                           f"Display {stats['display_fps']:.1f} FPS | "
+                                           f"Copy {sink['copy_ms']:.2f} ms, {sink['allocations']} allocations")
+
+            # Poll for new frames (never blocks), as often as the governor allows
+            self.webcam_job = self.root.after(self.governor.interval_ms, self.update_webcam_feed)
 
     def detect_burgers(self, frame):
-        """Detects burger patties using color and shape analysis."""
-        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-        
-        # Define color range for detecting browned patties (adjust if needed)
-        lower_brown = np.array([5, 50, 50])  # Lower HSV threshold
-        upper_brown = np.array([30, 255, 255])  # Upper HSV threshold
-        mask = cv2.inRange(hsv, lower_brown, upper_brown)
-        
-        # Find contours from the mask
-        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        for cnt in contours:
-            area = cv2.contourArea(cnt)
-            if area > 500:  # Ignore small noise
-                x, y, w, h = cv2.boundingRect(cnt)
-                cv2.rectangle(frame, (x, y), (x+w, y+h), (0, 255, 0), 2)  # Draw bounding box
-                cv2.putText(frame, "Burger", (x, y-10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
-        
-        return frame
+        """Detects burger patties and follows them across frames with stable IDs."""
+        self.frame_size = (frame.shape[1], frame.shape[0])
+        tracks = self.tracker.step(frame, self.detect_boxes)
+        boxes = [track.box for track in tracks]
+        labels = [f"Burger #{track.id}" for track in tracks]
+        if self.classifier and tracks:
+            # One batched pass classifies every patty in the frame
+            states = self.classifier.classify(frame, box_contours(boxes))
+            labels = [f"{label} {state}" for label, (state, _) in zip(labels, states)]
+        return self.detector.draw(frame, boxes, labels)
+
+    def detect_boxes(self, frame):
+        """Finds burger boxes inline, or on the worker-process pool when DETECTION_TILES is set."""
+        if not DETECTION_TILES or self.detection_pool_failed:
+            return self.detector.detect(frame)
+        # The pool only sees the griddle ROI, its tiles split that region
+        region, roi_x, roi_y = frame, 0, 0
+        if GRIDDLE_ROI:
+            roi_x, roi_y, roi_w, roi_h = self.detector.clip_roi(frame.shape)
+            region = frame[roi_y:roi_y + roi_h, roi_x:roi_x + roi_w]
+        if (self.multi_detector is None or self.multi_detector_stale
+                or self.multi_detector.frame_shapes[0] != region.shape):
+            if self.multi_detector:
+                self.multi_detector.close()
+            self.multi_detector_stale = False
+            self.multi_detector = MultiDetector([region.shape], tiles=DETECTION_TILES,
+                                                detector_kwargs={'scale': DETECTION_SCALE,
+                                                                 'lower': self.detector.lower.tolist(),
+                                                                 'upper': self.detector.upper.tolist()})
+        try:
+            boxes = self.multi_detector.detect(region)
+        except RuntimeError as e:
+            print(f"Error in detection workers, detecting inline from now on: {e}")
+            self.multi_detector.close()
+            self.multi_detector = None
+            self.detection_pool_failed = True
+            return self.detector.detect(frame)
+        return [(x + roi_x, y + roi_y, w, h) for x, y, w, h in boxes]
+
+    def queue_track_event(self, kind, track):
+        """Tracker callback (processing thread): hands the event to the Tk thread."""
+        x, y = track.centroid
+        self.track_events.put((kind, track.id, x, y))
+
+    def apply_track_events(self):
+        """Creates, moves or releases simulated-view patties for tracked burgers."""
+        events = []
+        while True:
+            try:
+                events.append(self.track_events.get_nowait())
+            except queue.Empty:
+                break
+        if not events:
+            return
+
+        # One lookup maps every camera position onto the simulated view (calibrated, or just scaled)
+        positions = self.mapper.map([(x, y) for _, _, x, y in events], self.frame_size, self.canvas_size())
+        for (kind, track_id, _, _), (x, y) in zip(events, positions.tolist()):
+            if kind == "new":
+                # A patty that was hidden (e.g. under the spatula) comes back as a new track: keep its timer
+                patty_id = self.simulation.patty_at(x, y, among=self.lost_patties)
+                if patty_id is None:
+                    patty_id = self.simulation.add(x, y, TRACKED_PATTY_TIME)
+                else:
+                    self.lost_patties.discard(patty_id)
+                    self.simulation.move(patty_id, x, y)
+                self.track_patties[track_id] = patty_id
+                self.patty_tracks[patty_id] = track_id
+            elif kind == "update" and track_id in self.track_patties:
+                self.simulation.move(self.track_patties[track_id], x, y)
+            elif kind == "lost" and track_id in self.track_patties:
+                # The timer keeps running, the patty may just be hidden under the spatula
+                patty_id = self.track_patties.pop(track_id)
+                del self.patty_tracks[patty_id]
+                self.lost_patties.add(patty_id)
+
+    def toggle_hud(self, event=None):
+        """Shows or hides the performance overlay in the top-right corner."""
+        self.hud_visible = not self.hud_visible
+        if self.hud_visible:
+            self.hud_label.place(relx=1.0, y=0, anchor="ne")
+            self.hud_label.lift()
+        else:
+            self.hud_label.place_forget()
+
+    def update_metrics(self):
+        """Publishes app-level gauges, adapts the video load and refreshes the HUD twice a second."""
+        metrics.set_gauge("active_patties", len(self.simulation))
+        self.governor.update()
+        self.tracker.detect_every = self.governor.stride
+        if self.pipeline:
+            self.pipeline.capture_interval = self.governor.capture_interval
+            for name, value in self.pipeline.stats().items():
+                metrics.set_gauge(name, round(value, 2))
+
+        if self.hud_visible:
+            gauges = metrics.snapshot()['gauges']
+            self.hud_label.config(text=f"Capture {gauges.get('capture_fps', 0):5.1f} FPS\n"
+                                       f"Display {gauges.get('display_fps', 0):5.1f} FPS\n"
+                                       f"Latency {metrics.percentile_ms('frame_latency', 50):5.1f} ms "
+                                       f"(p95 {metrics.percentile_ms('frame_latency', 95):.1f})\n"
+                                       f"Tk lag  {metrics.percentile_ms('tk_lag', 95):5.1f} ms p95\n"
+                                       f"Video   every {self.governor.interval_ms} ms, "
+                                       f"detect 1/{self.governor.stride}\n"
+                                       f"Patties {gauges['active_patties']:5d}")
+        self.root.after(500, self.update_metrics)
+
+    def canvas_size(self):
+        if not hasattr(self, 'canvas'):
+            return (1, 1)
+        return (self.canvas.winfo_width(), self.canvas.winfo_height())
+
+    def build_calibration(self, screen, text):
+        self.add_screen_title(screen, text)
+
+        self.calibration_label = tk.Label(screen, text="", font=("Arial", 14), fg="white", bg="gray25", justify="left")
+        self.calibration_label.pack(pady=10)
+
+        buttons = tk.Frame(screen, bg="gray25")
+        buttons.pack(pady=10)
+        tk.Button(buttons, text="Fit Patty Colors", command=self.calibrate_colors).pack(side="left", padx=10)
+        tk.Button(buttons, text="Map Camera to Simulated View", command=self.calibrate_mapping).pack(side="left", padx=10)
+        self.show_calibration_status()
+
+    def show_calibration_status(self, message=""):
+        """Summarizes the current calibration profile, with an optional message on top."""
+        profile = self.calibration
+        lines = [message, ""] if message else []
+        lines.append(f"Profile version {profile.version}, "
+                     f"last changed {time.strftime('%Y-%m-%d %H:%M', time.localtime(profile.created))}")
+        if profile.lower:
+            lines.append(f"Patty colors: HSV {profile.lower} to {profile.upper}")
+        else:
+            lines.append("Patty colors: default range, not calibrated")
+        if profile.homography:
+            lines.append(f"Camera mapping: {profile.frame_size[0]}x{profile.frame_size[1]} camera to "
+                         f"{profile.canvas_size[0]}x{profile.canvas_size[1]} view, "
+                         f"error {profile.mapping_error:.1f} px")
+        else:
+            lines.append("Camera mapping: not calibrated, camera frames are scaled onto the view")
+        self.calibration_label.config(text="\n".join(lines))
+
+    def grab_calibration_frames(self, count, on_frames):
+        """Reads a few mirrored frames on a worker thread, then calls on_frames(frames) on the Tk thread.
+
+        Returns False without reading while the griddle view's pipeline (or an
+        earlier grab) is using the camera.
+        """
+        if self.pipeline or self.camera_busy():
+            return False
+        cap = self.camera.acquire()
+        if cap is None:
+            on_frames([])
+            return True
+        frames = []
+
+        def read_frames():
+            for _ in range(count * 3):  # Allow for a few failed reads
+                ret, frame = cap.read()
+                if ret:
+                    frames.append(cv2.flip(frame, 1))  # Same mirroring as process_frame
+                if len(frames) == count:
+                    break
+
+        self.calibration_reader = threading.Thread(target=read_frames, name="calibration-frames", daemon=True)
+        self.calibration_reader.start()
+        self.root.after(50, lambda: self.collect_calibration_frames(frames, on_frames))
+        return True
+
+    def camera_busy(self):
+        """True while a calibration grab or a stopped pipeline's capture thread may still read the device."""
+        if self.stopping_pipeline and self.stopping_pipeline.stopped:
+            self.stopping_pipeline = None
+        return bool(self.calibration_reader or self.stopping_pipeline)
+
+    def collect_calibration_frames(self, frames, on_frames):
+        """Checks back until the reader thread is done, then hands its frames over."""
+        if self.calibration_reader.is_alive():
+            self.root.after(50, lambda: self.collect_calibration_frames(frames, on_frames))
+            return
+        self.calibration_reader = None
+        self.camera.release()
+        on_frames(frames)
+
+    def save_calibration_profile(self):
+        self.calibration.created = time.time()
+        save_calibration(self.calibration)
+
+    def calibrate_colors(self):
+        """Fits the detector's HSV bounds to the reference images and the patties on the griddle."""
+        if self.grab_calibration_frames(10, self.finish_colors):
+            self.show_calibration_status("Reading camera frames...")
+        else:
+            self.show_calibration_status("The camera is busy, try again in a moment.")
+
+    def finish_colors(self, frames):
+        bounds = fit_colors(frames, self.detector)
+        if bounds is None:
+            self.show_calibration_status("Not enough patty pixels to fit colors, check the reference images.")
+            return
+        self.calibration.lower, self.calibration.upper = bounds
+        self.save_calibration_profile()
+        self.detector.set_bounds(*bounds)
+        self.multi_detector_stale = True
+        self.show_calibration_status(f"Fitted colors from the reference images and {len(frames)} camera frames.")
+
+    def calibrate_mapping(self):
+        """Shows a checkerboard on the simulated view, then looks for it in the camera image."""
+        self.open_simulated_view()
+        self.simulated_window.update_idletasks()
+        width, height = self.canvas_size()
+        squares, corners = checkerboard_squares(width, height)
+        self.canvas.create_rectangle(0, 0, width, height, fill="white", outline="", tags="checkerboard")
+        for square in squares:
+            self.canvas.create_rectangle(*square, fill="black", outline="", tags="checkerboard")
+        self.show_calibration_status("Looking for the checkerboard...")
+        # Give the display (or projector) a moment to actually show the board
+        self.root.after(1000, lambda: self.read_checkerboard(corners, (width, height)))
+
+    def read_checkerboard(self, canvas_corners, canvas_size):
+        # The griddle view may have been opened meanwhile, its pipeline then owns the camera
+        if not self.grab_calibration_frames(5, lambda frames: self.finish_mapping(frames, canvas_corners, canvas_size)):
+            self.canvas.delete("checkerboard")
+            self.show_calibration_status("Mapping cancelled, the camera was in use. Try again from this tab.")
+
+    def finish_mapping(self, frames, canvas_corners, canvas_size):
+        self.canvas.delete("checkerboard")
+        for frame in reversed(frames):
+            camera_corners = find_checkerboard(frame)
+            if camera_corners is not None:
+                break
+        else:
+            self.show_calibration_status("Checkerboard not found. Make sure the camera sees the whole simulated view.")
+            return
+
+        homography, error = fit_homography(camera_corners, canvas_corners)
+        if homography is None:
+            self.show_calibration_status("Could not compute a mapping from the checkerboard.")
+            return
+        self.calibration.homography = homography.tolist()
+        self.calibration.frame_size = (frame.shape[1], frame.shape[0])
+        self.calibration.canvas_size = canvas_size
+        self.calibration.mapping_error = error
+        self.save_calibration_profile()
+        self.mapper = CoordinateMapper.from_profile(self.calibration)
+        self.show_calibration_status("Camera mapped to the simulated view.")
 
     def close_webcam(self):
         """Releases the webcam when switching away from the Webcam/Griddle View."""
+        if self.webcam_job:
+            self.root.after_cancel(self.webcam_job)
+            self.webcam_job = None
+        if self.pipeline:
+            # Stop reading before the device is paused. A read stuck on a slow camera keeps it busy until it returns.
+            if not self.pipeline.stop():
+                self.stopping_pipeline = self.pipeline
+            self.pipeline = None
         if self.cap:
-            self.cap.release()
+            self.camera.release()  # Stays open for the grace period
             self.cap = None
 
+    def on_close(self):
+        """Stops the pipeline and really releases the camera before exiting."""
+        self.close_webcam()
+        if self.calibration_reader:
+            self.calibration_reader.join()  # At most a few reads, then the device can go
+        if self.stopping_pipeline:
+            self.stopping_pipeline.stop()
+        self.camera.close()
+        if self.metrics_exporter:
+            self.metrics_exporter.stop()
+            self.metrics_exporter.write()  # Final numbers of this session
+        if self.multi_detector:
+            self.multi_detector.close()
+        self.patty_log.close()
+        self.root.destroy()
+
     def analyze_burger_images(self):
-        """Loads burger images and dynamically determines cooking states."""
+        """Shows the cooking states of the reference images (analyzed once, then cached)."""
         try:
-            self.raw_patty = cv2.imread("patty_raw.png")
-            self.half_patty = cv2.imread("patty_half_cooked.png")
-            self.cooked_patty = cv2.imread("patty_ready.png")
+            profile = load_reference_profile()
 
-            if self.raw_patty is None or self.half_patty is None or self.cooked_patty is None:
+            if profile is None:
                 print("Error: One or more images not found!")
                 self.analysis_label.config(text="Error: One or more images not found!")
                 return
 
-            print("All images loaded successfully!")
-            height_raw, width_raw, _ = self.raw_patty.shape
-            self.half_patty = cv2.resize(self.half_patty, (width_raw, height_raw))
-            self.cooked_patty = cv2.resize(self.cooked_patty, (width_raw, height_raw))
-
-            # Convert to HSV
-            hsv_raw = cv2.cvtColor(self.raw_patty, cv2.COLOR_BGR2HSV)
-            hsv_half = cv2.cvtColor(self.half_patty, cv2.COLOR_BGR2HSV)
-            hsv_cooked = cv2.cvtColor(self.cooked_patty, cv2.COLOR_BGR2HSV)
-
-            # Extract dominant hue values using the center region of the patty
-            hues = [
-                self.get_dominant_hue(hsv_raw),
-                self.get_dominant_hue(hsv_half),
-                self.get_dominant_hue(hsv_cooked)
-            ]
+            hues = profile.hues
 
             # Assign fixed categories
             labels = ["Raw (10%)", "Half-Cooked (60%)", "Fully Cooked (100%)"]
@@ -227,16 +579,6 @@ class CookingApp:
             print(f"Error in processing images: {e}")
             self.analysis_label.config(text=f"Error: {e}")
 
-    def get_dominant_hue(self, hsv_image):
-        """Finds the dominant hue value in the central region of an image, ignoring dark pixels."""
-        h, w, _ = hsv_image.shape
-        center_region = hsv_image[h//4:3*h//4, w//4:3*w//4, 0]  # Crop center
-        hue_values = center_region.flatten()
-        hue_values = hue_values[hue_values > 10]  # Ignore dark pixels
-        if len(hue_values) == 0:
-            return 0
-        return int(np.median(hue_values))
-    
     def hue_to_rgb(self, hue):
         """Converts a hue value to an approximate RGB color."""
         import colorsys
@@ -245,23 +587,20 @@ class CookingApp:
 
     def update_burger_image(self):
         """Displays the combined burger cooking images in the UI."""
-        combined_image = np.hstack((self.raw_patty, self.half_patty, self.cooked_patty))
-        combined_image = cv2.cvtColor(combined_image, cv2.COLOR_BGR2RGB)
-        img = Image.fromarray(combined_image)
-        img = img.resize((600, 200))
-        img_tk = ImageTk.PhotoImage(img)
+        profile = load_reference_profile()
+        if profile is None:
+            return
+        # The PhotoImage is only rebuilt when the reference images change
+        if self.burger_thumbnail_signature != profile.signature:
+            self.burger_thumbnail = ImageTk.PhotoImage(Image.fromarray(profile.thumbnail))
+            self.burger_thumbnail_signature = profile.signature
 
-        self.image_label.configure(image=img_tk)
-        self.image_label.image = img_tk
+        self.image_label.configure(image=self.burger_thumbnail)
+        self.image_label.image = self.burger_thumbnail
 
-    def setup_coordinate_testing(self):
+    def setup_coordinate_testing(self, screen, text):
         """Creates UI for entering patty positions and timer duration."""
-        if self.current_screen:
-            self.current_screen.destroy()
-        self.current_screen = tk.Frame(self.main_content, bg="gray25") #-----------------
-        self.current_screen.pack(fill="both", expand=True)
-
-        frame = tk.Frame(self.current_screen, bg="gray25")
+        frame = tk.Frame(screen, bg="gray25")
         frame.pack(pady=400)
 
         tk.Label(frame, text="X Position:", bg="gray25", fg="white", font=("Arial", 15)).grid(row=0, column=0)
@@ -275,8 +614,13 @@ class CookingApp:
         self.y_entry.grid(row=1, column=1)
         self.time_entry.grid(row=2, column=1)
 
+        # Positions can also be entered in camera pixels, mapped through the calibration
+        self.camera_coordinates = tk.BooleanVar(value=False)
+        tk.Checkbutton(frame, text="Camera pixels", variable=self.camera_coordinates, bg="gray25", fg="white",
+                       selectcolor="gray40", font=("Arial", 12)).grid(row=3, column=0, columnspan=2)
+
         add_button = tk.Button(frame, text="Add Patty", command=self.add_patty)
-        add_button.grid(row=3, column=0, columnspan=2, pady=10)
+        add_button.grid(row=4, column=0, columnspan=2, pady=10)
 
     def open_simulated_view(self):
         """Creates or reopens the secondary window for displaying simulated patties."""
@@ -292,6 +636,8 @@ class CookingApp:
 
         self.canvas = tk.Canvas(self.simulated_window, bg="black")
         self.canvas.pack(fill="both", expand=True)
+        self.canvas.bind("<Double-Button-1>", self.flip_patty)  # Logged for the cook-time audit
+        self.simulation.set_renderer(CanvasRenderer(self.canvas))
 
     def hide_simulated_view(self):
         """Hides the simulated view instead of destroying it."""
@@ -307,61 +653,24 @@ class CookingApp:
             print("Invalid input! Enter integer values for X, Y, and Time.")
             return
 
-        patty = {'x': x, 'y': y, 'time': time_value, 'circle': None, 'text': None, 'blinking': False, 'blink_state': True}
-        self.patties.append(patty)
-        self.update_simulated_view()
-        self.start_timer(patty)
+        if self.camera_coordinates.get():
+            x, y = self.mapper.map([(x, y)], self.frame_size, self.canvas_size())[0].tolist()
+        self.simulation.add(x, y, time_value)
 
-    def update_simulated_view(self):
-        """Redraws patties on the simulated screen."""
-        if not hasattr(self, 'canvas'):
-            return
-        self.canvas.delete("all")
-        
-        for patty in self.patties:
-            color = "green" if patty['time'] > 10 else "orange" if patty['time'] > 5 else "red"
-            patty['circle'] = self.canvas.create_oval(
-                patty['x'] - 150, patty['y'] - 150,
-                patty['x'] + 150, patty['y'] + 150,
-                fill=color
-            )
-            patty['text'] = self.canvas.create_text(
-                patty['x'], patty['y'], 
-                text=str(patty['time']), 
-                font=("Arial", 30), 
-                fill="white" if patty ['time'] > 10 else "black" if patty['time'] > 5 else "white"
-            )
-    
-    def start_timer(self, patty):
-        """Countdown for the patty timer using after()."""
-        def countdown():
-            if patty['time'] >= 0:
-                self.update_simulated_view()
-                patty['time'] -= 1
-
-                if patty['time'] == 4 and not patty['blinking']:
-                    patty['blinking'] = True
-                    self.blink_patty(patty)
-
-                self.root.after(1000, countdown)
-            else:
-                self.patties.remove(patty)
-                self.update_simulated_view()
-        countdown()
-
-    def blink_patty(self, patty):
-        """Blinks the patty at a constant rate of 0.4 seconds."""
-        def toggle():
-            if patty in self.patties and patty['time'] >= 0:
-                patty['blink_state'] = not patty['blink_state']
-                new_color = "red" if patty['blink_state'] else "black"
-                self.canvas.itemconfig(patty['circle'], fill=new_color)
-                self.root.after(400, toggle)
-
-        if patty['blinking']:
-            toggle()
+    def flip_patty(self, event):
+        """Records a flip of the patty under the pointer."""
+        patty_id = self.simulation.patty_at(event.x, event.y)
+        if patty_id is not None:
+            self.simulation.flip(patty_id)
+
+    def on_patty_removed(self, patty_id):
+        """Forgets the camera track of a finished patty."""
+        self.lost_patties.discard(patty_id)
+        if patty_id in self.patty_tracks:
+            del self.track_patties[self.patty_tracks.pop(patty_id)]
 
 if __name__ == "__main__":
     root = tk.Tk()
-    app = CookingApp(root)
+    # Optional argument: video file, frame directory or camera index to use as the griddle feed
+    app = CookingApp(root, sys.argv[1] if len(sys.argv) > 1 else None)
     root.mainloop()
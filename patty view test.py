@@ -1,5 +1,6 @@
 import tkinter as tk
 from screeninfo import get_monitors
+from patty_engine import CanvasRenderer, PattySimulation, TkTimers
 
 class CookingApp:
     def __init__(self, root):
@@ -15,14 +16,14 @@ class CookingApp:
         self.root.geometry(f"{self.primary_monitor.width}x{self.primary_monitor.height}+{self.primary_monitor.x}+{self.primary_monitor.y}")
         self.root.state('zoomed')
         
+        # Patty timers, blinks and drawing are shared with the main app
+        self.simulation = PattySimulation(TkTimers(self.root))
+        
         # UI for Testing Console
         self.setup_testing_console()
         
         # Open Secondary Window (Testing View)
         self.open_testing_view()
-        
-        # Store patties data
-        self.patties = []
     
     def setup_testing_console(self):
         """Creates UI for entering patty positions and timer duration"""
@@ -59,6 +60,7 @@ class CookingApp:
         
         self.canvas = tk.Canvas(self.second_window, bg="black")
         self.canvas.pack(fill="both", expand=True)
+        self.simulation.set_renderer(CanvasRenderer(self.canvas))
     
     def add_patty(self):
         """Adds a patty with a countdown timer"""
@@ -70,70 +72,7 @@ class CookingApp:
             print("Invalid input! Enter integer values for X, Y, and Time.")
             return
         
-        patty = {'x': x, 'y': y, 'time': time_value, 'circle': None, 'text': None, 'blinking': False, 'blink_state': True}
-        self.patties.append(patty)
-        
-        # Start countdown using after method
-        self.update_testing_view()
-        self.start_timer(patty)
-    
-    def update_testing_view(self):
-        """Redraws patties on the secondary screen"""
-        if not hasattr(self, 'canvas'):
-            return
-        
-        if isinstance(self.canvas, tk.Label):  # If it's a Label (no second monitor)
-            return  # Do nothing
-        
-        # Clear canvas if it's a Canvas widget
-        self.canvas.delete("all")
-        
-        for patty in self.patties:
-            color = "green" if patty['time'] > 10 else "orange" if patty['time'] > 5 else "red"
-            patty['circle'] = self.canvas.create_oval(
-                patty['x'] - 150, patty['y'] -  150,
-                patty['x'] + 150, patty['y'] + 150,
-                fill=color
-            )
-            patty['text'] = self.canvas.create_text(
-                patty['x'], patty['y'] - 5, 
-                text=str(patty['time']), 
-                font=("Arial", 30), 
-                fill="white" if patty ['time'] > 10 else "black" if patty['time'] > 5 else "white"
-            )
-    
-    def start_timer(self, patty):
-        """Countdown for the patty timer using after()"""
-        def countdown():
-            if patty['time'] >= 0:
-                self.update_testing_view()
-                patty['time'] -= 1
-                
-                # Start blinking when time <= 4
-                if patty['time'] == 4 and not patty['blinking']:
-                    patty['blinking'] = True
-                    self.blink_patty(patty)
-                
-                self.root.after(1000, countdown)  # Update every second
-            else:
-                # Remove patty when time is up
-                self.patties.remove(patty)
-                self.update_testing_view()
-        
-        countdown()
-    
-    def blink_patty(self, patty):
-        """Blinks the patty at a constant rate of 0.4 seconds using Tkinter's after()"""
-        def toggle():
-            if patty in self.patties and patty['time'] >= 0:
-                patty['blink_state'] = not patty['blink_state']
-                new_color = "red" if patty['blink_state'] else "black"
-                self.canvas.itemconfig(patty['circle'], fill=new_color)
-                self.root.after(400, toggle)  #  0.4s interval blinking
-        
-        # Start blinking only if it's not already blinking
-        if patty['blinking']:
-            toggle()
+        self.simulation.add(x, y, time_value)
 
 # Run the application
 if __name__ == "__main__":
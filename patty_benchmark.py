@@ -0,0 +1,105 @@
+"""Headless benchmark of the patty simulation engine.
+
+Usage:
+    python patty_benchmark.py
+    python patty_benchmark.py --sizes 10,100,1000,10000 --ticks 30
+
+For each number of concurrent patties it measures the cost of one scheduler
+tick (every patty's displayed second changes), the cost of the redraw that
+follows, the canvas calls that redraw makes, and the memory held by the
+engine. No Tk or display is needed. test_patty_engine.py runs the same
+measurements as a pytest-benchmark suite.
+"""
+import argparse
+import random
+import time
+import tracemalloc
+from collections import Counter
+
+from patty_engine import CanvasRenderer, ManualTimers, PattySimulation
+from patty_scheduler import FakeClock
+
+
+class RecordingCanvas:
+    """Stands in for tk.Canvas and counts every call made on it."""
+
+    def __init__(self):
+        self.calls = Counter()
+        self.next_item = 1
+
+    def _new_item(self, name):
+        self.calls[name] += 1
+        item, self.next_item = self.next_item, self.next_item + 1
+        return item
+
+    def create_oval(self, *args, **kwargs):
+        return self._new_item("create_oval")
+
+    def create_text(self, *args, **kwargs):
+        return self._new_item("create_text")
+
+    def coords(self, *args):
+        self.calls["coords"] += 1
+
+    def itemconfig(self, *args, **kwargs):
+        self.calls["itemconfig"] += 1
+
+    def delete(self, *args):
+        self.calls["delete"] += 1
+
+
+def build_simulation(count, seed=0):
+    """An engine with `count` patties that all outlast the benchmark."""
+    rng = random.Random(seed)
+    clock = FakeClock()
+    canvas = RecordingCanvas()
+    simulation = PattySimulation(ManualTimers(clock), clock, CanvasRenderer(canvas))
+    for _ in range(count):
+        simulation.add(rng.randint(0, 1920), rng.randint(0, 1080), rng.randint(600, 900))
+    simulation.redraw()
+    return simulation, clock, canvas
+
+
+def measure(count, ticks=20):
+    """Returns mean tick cost, mean redraw cost, canvas calls per redraw and engine memory."""
+    tracemalloc.start()
+    simulation, clock, canvas = build_simulation(count)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tick_time = redraw_time = 0.0
+    canvas.calls.clear()
+    for _ in range(ticks):
+        clock.advance(1.0)
+        start = time.perf_counter()
+        simulation.scheduler.run_due()
+        tick_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        simulation.redraw()
+        redraw_time += time.perf_counter() - start
+
+    return {
+        'patties': count,
+        'tick_us': tick_time / ticks * 1e6,
+        'redraw_us': redraw_time / ticks * 1e6,
+        'calls_per_redraw': sum(canvas.calls.values()) / ticks,
+        'memory_kb': memory / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the patty simulation engine without a display.")
+    parser.add_argument("--sizes", default="10,100,1000", help="Comma separated numbers of concurrent patties")
+    parser.add_argument("--ticks", type=int, default=20, help="Simulated seconds to measure")
+    args = parser.parse_args()
+
+    print(f"{'patties':>8}{'tick us':>12}{'redraw us':>12}{'calls/redraw':>14}{'memory KB':>12}")
+    for count in (int(v) for v in args.sizes.split(",")):
+        row = measure(count, args.ticks)
+        print(f"{row['patties']:>8}{row['tick_us']:>12.1f}{row['redraw_us']:>12.1f}"
+              f"{row['calls_per_redraw']:>14.1f}{row['memory_kb']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
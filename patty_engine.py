@@ -0,0 +1,257 @@
+import heapq
+import itertools
+import time
+
+import numpy as np
+
+from patty_scheduler import PattyScheduler
+from perf_metrics import metrics
+from patty_store import PattyStore, PATTY_COLORS, TEXT_COLORS
+
+PATTY_RADIUS = 150
+
+
+class TkTimers:
+    """Timer backend on top of Tk's after()/after_idle()."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def call_later(self, delay_ms, callback):
+        return self.root.after(delay_ms, callback)
+
+    def call_idle(self, callback):
+        return self.root.after_idle(callback)
+
+    def cancel(self, job):
+        self.root.after_cancel(job)
+
+
+class ManualTimers:
+    """Headless timer backend: callbacks only run when run_pending() is called.
+
+    Pair it with patty_scheduler.FakeClock to drive the simulation without Tk
+    or real time.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.jobs = []  # (due, seq, callback)
+        self.idle = []
+        self.pending = set()  # Jobs neither run nor cancelled yet
+        self.seq = itertools.count()
+
+    def call_later(self, delay_ms, callback):
+        job = next(self.seq)
+        heapq.heappush(self.jobs, (self.clock() + delay_ms / 1000, job, callback))
+        self.pending.add(job)
+        return job
+
+    def call_idle(self, callback):
+        job = next(self.seq)
+        self.idle.append((job, callback))
+        self.pending.add(job)
+        return job
+
+    def cancel(self, job):
+        self.pending.discard(job)  # Cancelling a job that already ran (or never existed) leaves nothing behind
+
+    def run_pending(self):
+        """Runs every due timer, then the idle callbacks, like one pass of the Tk loop."""
+        now = self.clock()
+        while self.jobs and self.jobs[0][0] <= now:
+            _, job, callback = heapq.heappop(self.jobs)
+            if job in self.pending:
+                self.pending.discard(job)
+                callback()
+        idle, self.idle = self.idle, []
+        for job, callback in idle:
+            if job in self.pending:
+                self.pending.discard(job)
+                callback()
+
+
+class CanvasRenderer:
+    """Draws patties as persistent oval and text items on a Tk-compatible canvas.
+
+    Works with tk.Canvas or anything exposing create_oval, create_text, coords,
+    itemconfig and delete. Items are created once per patty and then only
+    updated when the patty moved or its time changed; colors only when its
+    color level changed.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+
+    def draw(self, store):
+        ids = store.ids()
+        moved = (store.x[ids] != store.drawn_x[ids]) | (store.y[ids] != store.drawn_y[ids]) | (store.circle[ids] == 0)
+        changed = store.time[ids] != store.drawn_time[ids]
+        levels = store.color_levels(ids)
+
+        for i in np.flatnonzero(moved | changed):
+            patty_id = ids[i]
+            if store.circle[patty_id] == 0:
+                store.circle[patty_id] = self.canvas.create_oval(0, 0, 0, 0)
+                store.text[patty_id] = self.canvas.create_text(0, 0, font=("Arial", 30))
+            circle, text = int(store.circle[patty_id]), int(store.text[patty_id])
+
+            if moved[i]:
+                x, y = int(store.x[patty_id]), int(store.y[patty_id])
+                self.canvas.coords(circle, x - PATTY_RADIUS, y - PATTY_RADIUS, x + PATTY_RADIUS, y + PATTY_RADIUS)
+                self.canvas.coords(text, x, y)
+                store.drawn_x[patty_id], store.drawn_y[patty_id] = x, y
+
+            if changed[i]:
+                level = levels[i]
+                if level == store.drawn_level[patty_id]:
+                    self.canvas.itemconfig(text, text=str(store.time[patty_id]))
+                else:  # Colors are only touched when the patty crosses a threshold
+                    self.canvas.itemconfig(text, text=str(store.time[patty_id]), fill=TEXT_COLORS[level])
+                    if not store.blinking[patty_id]:  # Blinking patties get their fill from blink()
+                        self.canvas.itemconfig(circle, fill=PATTY_COLORS[level])
+                    store.drawn_level[patty_id] = level
+                store.drawn_time[patty_id] = store.time[patty_id]
+
+    def blink(self, store, patty_id):
+        if store.circle[patty_id]:
+            fill = "red" if store.blink_state[patty_id] else "black"
+            self.canvas.itemconfig(int(store.circle[patty_id]), fill=fill)
+
+    def erase(self, store, patty_id):
+        if store.circle[patty_id]:
+            self.canvas.delete(int(store.circle[patty_id]), int(store.text[patty_id]))
+
+
+class PattySimulation:
+    """The patty timer state machine, independent of Tk.
+
+    Patties live in a PattyStore, their countdowns and blinks in one
+    PattyScheduler. `timers` (TkTimers or ManualTimers) provides the single
+    wakeup for the scheduler and the coalesced idle redraw. `renderer` is
+    optional and can be attached later, e.g. once the simulated window exists.
+    `log` (a PattyLog) records adds, flips, finished and removed patties.
+    """
+
+    def __init__(self, timers, clock=time.monotonic, renderer=None, on_removed=None, log=None):
+        self.timers = timers
+        self.renderer = renderer
+        self.on_removed = on_removed  # Called with the patty ID after a patty is removed
+        self.log = log
+
+        self.store = PattyStore()
+        self.scheduler = PattyScheduler(clock, on_tick=self._on_tick, on_blink=self._on_blink, on_done=self._on_done)
+        self.wake_job = None
+        self.wake_deadline = None
+        self.redraw_pending = False
+
+    def __len__(self):
+        return len(self.store)
+
+    def set_renderer(self, renderer):
+        self.renderer = renderer
+        self.request_redraw()
+
+    def add(self, x, y, seconds, cooked=0):
+        """Adds a patty with a countdown timer and returns its ID.
+
+        `cooked` is how long a restored patty already cooked, it is only logged.
+        """
+        patty_id = self.store.add(x, y, seconds)
+        self.scheduler.add(patty_id, seconds)
+        if self.log:
+            self.log.add(patty_id, x, y, seconds, cooked)
+        self.request_redraw()
+        self.wake()
+        return patty_id
+
+    def move(self, patty_id, x, y):
+        if patty_id in self.store:
+            self.store.x[patty_id] = x
+            self.store.y[patty_id] = y
+            self.request_redraw()
+
+    def flip(self, patty_id):
+        if patty_id in self.store and self.log:
+            self.log.flip(patty_id)
+
+    def patty_at(self, x, y, radius=PATTY_RADIUS, among=None):
+        """ID of the patty drawn nearest to (x, y) within `radius`, or None.
+
+        `among` limits the search to the given patty IDs.
+        """
+        ids = self.store.ids() if among is None else np.fromiter(among, dtype=np.intp, count=len(among))
+        if not len(ids):
+            return None
+        distance = np.hypot(self.store.x[ids] - x, self.store.y[ids] - y)
+        nearest = int(np.argmin(distance))
+        return int(ids[nearest]) if distance[nearest] <= radius else None
+
+    def remove(self, patty_id):
+        """Takes a patty off before its countdown ends."""
+        if patty_id not in self.store:
+            return
+        if self.log:
+            self.log.removed(patty_id)
+        self._discard(patty_id)
+
+    def _on_done(self, patty_id):
+        if self.log:
+            self.log.done(patty_id)
+        self._discard(patty_id)
+
+    def _discard(self, patty_id):
+        """Removes a patty, its timer and its drawn items."""
+        self.scheduler.remove(patty_id)
+        if self.renderer:
+            self.renderer.erase(self.store, patty_id)
+        self.store.remove(patty_id)
+        if self.on_removed:
+            self.on_removed(patty_id)
+
+    def request_redraw(self):
+        """Coalesces any number of redraw requests into one update per idle cycle."""
+        if not self.redraw_pending:
+            self.redraw_pending = True
+            self.timers.call_idle(self.redraw)
+
+    def redraw(self):
+        self.redraw_pending = False
+        if self.renderer:
+            with metrics.span("canvas_redraw"):
+                self.renderer.draw(self.store)
+
+    def wake(self):
+        """Arms the single timer callback for the scheduler's next due event."""
+        deadline = self.scheduler.next_deadline()
+        if deadline == self.wake_deadline:
+            return
+        if self.wake_job is not None:
+            self.timers.cancel(self.wake_job)
+            self.wake_job = None
+        self.wake_deadline = deadline
+        if deadline is not None:
+            delay_ms = max(0, int((deadline - self.scheduler.clock()) * 1000 + 0.999))  # Never wake early
+            self.wake_job = self.timers.call_later(delay_ms, self.run_due)
+
+    def next_event_delay(self):
+        """Seconds until the next timer or blink event, or None when no patty is cooking."""
+        return self.scheduler.next_delay()
+
+    def run_due(self):
+        """Fires all due timer and blink events, then sleeps until the next one."""
+        self.wake_job = None
+        self.wake_deadline = None
+        with metrics.span("timer_tick"):
+            self.scheduler.run_due()
+        self.wake()
+
+    def _on_tick(self, patty_id, time_left):
+        self.store.time[patty_id] = time_left
+        self.request_redraw()
+
+    def _on_blink(self, patty_id, lit):
+        self.store.blinking[patty_id] = True
+        self.store.blink_state[patty_id] = lit
+        if self.renderer:
+            self.renderer.blink(self.store, patty_id)
@@ -0,0 +1,222 @@
+"""Append-only event log of patty timers, with snapshots for fast restore.
+
+Every add, flip, done and removed event is one compact JSON line stamped
+with the monotonic clock. Each app session starts with a header line that
+pairs a monotonic reading with the wall clock, so times can be compared
+across restarts. Events are buffered and written in batches by a writer
+thread, so disk latency (and fsync) never stalls the Tk loop.
+
+A snapshot stores the live patties together with the byte offset in the log
+it is valid for. Restoring reads the snapshot and replays only the tail of
+the log written after it.
+"""
+import json
+import os
+import queue
+import threading
+import time
+
+from perf_metrics import metrics
+
+PATTY_LOG_FILE = "patty_log.jsonl"
+SNAPSHOT_VERSION = 1
+
+
+def apply_event(live, event, wall):
+    """Updates the live patty table (ID -> state dict, wall-clock times) with one event."""
+    kind = event['e']
+    if kind == "session":
+        # A new session re-adds everything it restored, so older patties are superseded
+        live.clear()
+    elif kind == "add":
+        live[event['id']] = {'x': event['x'], 'y': event['y'], 'finish': wall + event['s'],
+                             'started': wall - event.get('c', 0), 'flips': 0}
+    elif kind == "flip" and event['id'] in live:
+        live[event['id']]['flips'] += 1
+    elif kind in ("done", "removed"):
+        live.pop(event['id'], None)
+
+
+def read_events(path, offset=0, session=None):
+    """Yields (wall time, event) for every event from `offset` on.
+
+    `session` is the (wall, mono) header in effect at `offset` when reading
+    starts in the middle of a session. A torn last line (crash mid-write) is
+    skipped.
+    """
+    try:
+        f = open(path, "rb")
+    except OSError:
+        return
+    with f:
+        f.seek(offset)
+        for line in f:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                print(f"Warning: Skipping unreadable line in {path}")
+                continue
+            if event['e'] == "session":
+                session = (event['wall'], event['mono'])
+                yield event['wall'], event
+            elif session is not None:
+                yield session[0] + (event['t'] - session[1]), event
+
+
+class PattyLog:
+    """Records patty events for PattySimulation and restores live timers after a restart.
+
+    `timers` (TkTimers or ManualTimers) schedules the batched flushes. Without
+    timers every flush() has to be called by the owner.
+    """
+
+    def __init__(self, path=PATTY_LOG_FILE, timers=None, clock=time.monotonic, wall_clock=time.time,
+                 flush_interval=1.0, snapshot_every=200):
+        self.path = path
+        self.snapshot_path = os.path.splitext(path)[0] + ".snapshot.json"
+        self.timers = timers
+        self.clock = clock
+        self.wall_clock = wall_clock
+        self.flush_interval = flush_interval
+        self.snapshot_every = snapshot_every
+
+        self.live = {}           # Patty ID -> state, as of the last event (buffered or not)
+        self.session = None      # (wall, mono) of this session's header
+        self.buffer = []
+        self.flush_job = None
+        self.offset = 0          # Bytes of the log file written so far
+        self.since_snapshot = 0  # Events written since the last snapshot
+        self.file = None
+        self.writes = queue.SimpleQueue()  # (kind, payload) for the writer thread, None to stop
+        self.writer = None
+
+    def restore(self):
+        """Starts a session and returns the patties still cooking when the app last ran.
+
+        Each entry is a dict with x, y, remaining (seconds left) and cooked
+        (seconds already cooked). Patties whose time ran out while the app was
+        closed are left out. The caller is expected to add them back, which
+        logs them again under this session.
+        """
+        live, offset, session = {}, 0, None
+        try:
+            with open(self.snapshot_path) as f:
+                snapshot = json.load(f)
+            if snapshot.get('version') == SNAPSHOT_VERSION and snapshot['offset'] <= os.path.getsize(self.path):
+                live = {int(patty_id): state for patty_id, state in snapshot['live'].items()}
+                offset, session = snapshot['offset'], tuple(snapshot['session'])
+        except (OSError, ValueError, KeyError):
+            pass  # No usable snapshot, replay the whole log
+
+        for wall, event in read_events(self.path, offset, session):
+            apply_event(live, event, wall)
+
+        now = self.wall_clock()
+        restored = [{'x': state['x'], 'y': state['y'], 'remaining': state['finish'] - now,
+                     'cooked': now - state['started']}
+                    for state in live.values() if state['finish'] > now]
+
+        try:
+            self.file = open(self.path, "ab")
+            self.offset = self.file.tell()
+            if self.offset and not self._ends_with_newline():
+                # A crash tore the last line, end it so the session header starts a line of its own
+                self.file.write(b"\n")
+                self.file.flush()
+                self.offset += 1
+            self.writer = threading.Thread(target=self._write_loop, name="patty-log", daemon=True)
+            self.writer.start()
+        except OSError as e:
+            print(f"Warning: Could not open patty log: {e}")
+        self.session = (now, self.clock())
+        self._append({'e': "session", 'wall': round(now, 3), 'mono': round(self.session[1], 3)})
+        return restored
+
+    def _ends_with_newline(self):
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def add(self, patty_id, x, y, seconds, cooked=0):
+        event = {'e': "add", 'id': int(patty_id), 'x': int(x), 'y': int(y), 's': round(seconds, 3)}
+        if cooked:
+            event['c'] = round(cooked, 3)
+        self._append(event)
+
+    def flip(self, patty_id):
+        self._append({'e': "flip", 'id': int(patty_id)})
+
+    def done(self, patty_id):
+        self._append({'e': "done", 'id': int(patty_id)})
+
+    def removed(self, patty_id):
+        self._append({'e': "removed", 'id': int(patty_id)})
+
+    def _append(self, event):
+        if event['e'] != "session":
+            event['t'] = round(self.clock(), 3)
+        if self.session is None:
+            self.session = (self.wall_clock(), self.clock())  # Logging without restore()
+        apply_event(self.live, event, self.session[0] + (event.get('t', self.session[1]) - self.session[1]))
+        self.buffer.append(event)
+        if len(self.buffer) >= 256:
+            self.flush()
+        elif self.timers and self.flush_job is None:
+            self.flush_job = self.timers.call_later(int(self.flush_interval * 1000), self.flush)
+
+    def flush(self):
+        """Hands the buffered events to the writer as one append, then snapshots if enough have piled up."""
+        if self.flush_job is not None:
+            self.timers.cancel(self.flush_job)
+            self.flush_job = None
+        if not self.buffer or self.writer is None:
+            return
+        data = b"".join(json.dumps(event, separators=(",", ":")).encode() + b"\n" for event in self.buffer)
+        self.writes.put(("events", data))
+        self.offset += len(data)  # The writer appends in order, so this is where the log ends once it's done
+        self.since_snapshot += len(self.buffer)
+        self.buffer = []
+        if self.since_snapshot >= self.snapshot_every:
+            self.snapshot()
+
+    def snapshot(self):
+        """Saves the live patties for the log position written so far."""
+        if self.buffer or self.writer is None:
+            return  # Only valid once everything in self.live is queued, flush() calls back here
+        data = {'version': SNAPSHOT_VERSION, 'offset': self.offset, 'session': self.session,
+                'live': self.live}
+        # Serialized now, while self.live matches self.offset; queued behind the events it covers
+        self.writes.put(("snapshot", json.dumps(data, separators=(",", ":"))))
+        self.since_snapshot = 0
+
+    def _write_loop(self):
+        """Writer thread: appends event batches (one fsync each) and replaces snapshots, in order."""
+        while True:
+            item = self.writes.get()
+            if item is None:
+                return
+            kind, payload = item
+            try:
+                with metrics.span("patty_log_write"):
+                    if kind == "events":
+                        self.file.write(payload)
+                        self.file.flush()
+                        os.fsync(self.file.fileno())  # One sync per batch, not per event
+                    else:
+                        with open(self.snapshot_path + ".tmp", "w") as f:
+                            f.write(payload)
+                        os.replace(self.snapshot_path + ".tmp", self.snapshot_path)
+            except OSError as e:
+                print(f"Warning: Could not write patty log {kind}: {e}")
+
+    def close(self):
+        """Writes everything still buffered and waits for the writer to finish."""
+        self.flush()
+        self.snapshot()
+        if self.writer:
+            self.writes.put(None)
+            self.writer.join()
+            self.writer = None
+        if self.file:
+            self.file.close()
+            self.file = None
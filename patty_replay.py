@@ -0,0 +1,192 @@
+"""Replays a patty event log on the Simulated View, or prints a cook-time audit.
+
+Usage:
+    python patty_replay.py                       # Replay patty_log.jsonl at 10x speed
+    python patty_replay.py old_log.jsonl --speed 60
+    python patty_replay.py --audit               # Cook time of every patty, no window
+
+Time between app sessions (while the app was closed) is shortened to at most
+--max-gap seconds of log time, so a replay doesn't sit idle overnight.
+"""
+import argparse
+import time
+import tkinter as tk
+
+from patty_engine import CanvasRenderer, PattySimulation, TkTimers
+from patty_log import PATTY_LOG_FILE, read_events
+
+
+def load_timeline(path, max_gap=5.0):
+    """Events with their replay time: seconds since the first event.
+
+    Only the pause before a session header (the app was closed) is shortened,
+    pauses within a session are kept so cook times replay at their true length.
+    """
+    timeline = []
+    previous = None
+    offset = 0.0
+    for wall, event in read_events(path):
+        if previous is not None and event['e'] == "session" and wall - previous > max_gap:
+            offset += wall - previous - max_gap
+        previous = wall
+        if not timeline:
+            offset = wall
+        timeline.append((wall - offset, event))
+    return timeline
+
+
+def audit(path):
+    """Per-patty records: start, cook time, flips and how it ended.
+
+    The end is 'done', 'removed', 'cooking' (still on in the last session) or
+    'closed' (the app was closed and the timer ran out before it restarted).
+    A patty restored after a restart continues its original record.
+    """
+    records = []
+    live = {}
+    carried = []  # Patties cooking when the previous session ended
+    for wall, event in read_events(path):
+        kind = event['e']
+        if kind == "session":
+            for record in carried:
+                record['end'] = "closed"
+            carried, live = list(live.values()), {}
+        elif kind == "add":
+            started = wall - event.get('c', 0)
+            record = None
+            if event.get('c'):
+                # Restored: the same spot and (to rounding) the same start as a carried patty
+                for candidate in carried:
+                    if (candidate['x'], candidate['y']) == (event['x'], event['y']) \
+                            and abs(candidate['started'] - started) < 1:
+                        record = candidate
+                        carried.remove(candidate)
+                        break
+            if record is None:
+                record = {'started': started, 'timer': event.get('c', 0) + event['s'], 'x': event['x'],
+                          'y': event['y'], 'cooked': None, 'flips': 0, 'end': "cooking"}
+                records.append(record)
+            live[event['id']] = record
+        elif kind == "flip" and event['id'] in live:
+            live[event['id']]['flips'] += 1
+        elif kind in ("done", "removed") and event['id'] in live:
+            record = live.pop(event['id'])
+            record['cooked'] = wall - record['started']
+            record['end'] = kind
+    for record in carried:
+        record['end'] = "closed"
+    return records
+
+
+def print_audit(records):
+    if not records:
+        print("No patties in the log.")
+        return
+    print(f"{'started':<20}{'timer s':>9}{'cooked s':>10}{'flips':>7}  end")
+    for record in records:
+        started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(record['started']))
+        cooked = f"{record['cooked']:.1f}" if record['cooked'] is not None else "-"
+        print(f"{started:<20}{record['timer']:>9.1f}{cooked:>10}{record['flips']:>7}  {record['end']}")
+
+
+class ScaledTimers(TkTimers):
+    """TkTimers whose delays run `speed` times faster."""
+
+    def __init__(self, root, speed):
+        super().__init__(root)
+        self.speed = speed
+
+    def call_later(self, delay_ms, callback):
+        return self.root.after(int(delay_ms / self.speed), callback)
+
+
+class Replay:
+    """Feeds logged events into a PattySimulation running on an accelerated clock."""
+
+    def __init__(self, root, timeline, speed):
+        self.root = root
+        self.timeline = timeline
+        self.speed = speed
+        self.position = 0
+        self.patties = {}        # Logged patty ID -> replayed patty ID
+        self.logged_ids = {}     # Replayed patty ID -> logged patty ID
+        self.flips = 0
+
+        self.status = tk.Label(root, text="", font=("Arial", 14), fg="white", bg="gray25", anchor="w")
+        self.status.pack(fill="x")
+        canvas = tk.Canvas(root, bg="black")
+        canvas.pack(fill="both", expand=True)
+
+        self.started = time.monotonic()
+        self.simulation = PattySimulation(ScaledTimers(root, speed), clock=self.log_time,
+                                          renderer=CanvasRenderer(canvas), on_removed=self.forget)
+
+    def log_time(self):
+        return (time.monotonic() - self.started) * self.speed
+
+    def start(self):
+        self.step()
+
+    def step(self):
+        """Applies every event that is due, then sleeps until the next one."""
+        now = self.log_time()
+        while self.position < len(self.timeline) and self.timeline[self.position][0] <= now:
+            self.apply(self.timeline[self.position][1])
+            self.position += 1
+        self.status.config(text=f"Log time {now:8.1f}s ({self.speed:g}x)   "
+                                f"events {self.position}/{len(self.timeline)}   "
+                                f"patties {len(self.simulation)}   flips {self.flips}")
+        if self.position < len(self.timeline):
+            delay = (self.timeline[self.position][0] - now) / self.speed
+            self.root.after(max(1, min(250, int(delay * 1000))), self.step)
+        elif len(self.simulation):
+            self.root.after(250, self.step)  # Let the last countdowns finish
+
+    def forget(self, patty_id):
+        """Drops the mapping of a replayed patty, whether its countdown ended or it was removed."""
+        logged_id = self.logged_ids.pop(patty_id, None)
+        if logged_id is not None:
+            del self.patties[logged_id]
+
+    def apply(self, event):
+        kind = event['e']
+        if kind == "session":
+            # The app restarted here, it re-adds whatever was still cooking
+            for patty_id in list(self.patties.values()):
+                self.simulation.remove(patty_id)
+        elif kind == "add":
+            patty_id = self.simulation.add(event['x'], event['y'], event['s'])
+            self.patties[event['id']] = patty_id
+            self.logged_ids[patty_id] = event['id']
+        elif kind == "flip":
+            self.flips += 1
+        elif kind in ("done", "removed") and event['id'] in self.patties:
+            self.simulation.remove(self.patties[event['id']])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay or audit the patty event log.")
+    parser.add_argument("log", nargs="?", default=PATTY_LOG_FILE, help="Patty log file")
+    parser.add_argument("--speed", type=float, default=10.0, help="Replay speed factor")
+    parser.add_argument("--max-gap", type=float, default=5.0, help="Longest pause (log seconds) kept in the replay")
+    parser.add_argument("--audit", action="store_true", help="Print cook times instead of replaying")
+    args = parser.parse_args()
+
+    if args.audit:
+        print_audit(audit(args.log))
+        return
+
+    timeline = load_timeline(args.log, args.max_gap)
+    if not timeline:
+        print(f"Error: No events found in {args.log}")
+        return
+
+    root = tk.Tk()
+    root.title(f"Replay of {args.log}")
+    root.geometry("1280x720")
+    Replay(root, timeline, args.speed).start()
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
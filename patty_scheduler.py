@@ -0,0 +1,177 @@
+import heapq
+import itertools
+import math
+import random
+import time
+
+EPSILON = 1e-9  # Absorbs float error when a deadline is compared against itself
+
+
+class PattyScheduler:
+    """Runs every patty countdown and blink from one heap of monotonic deadlines.
+
+    Remaining time is always derived from each timer's finish deadline, so a late
+    wakeup never adds drift. The owner only has to call run_due() when
+    next_delay() says the earliest event is due.
+    """
+
+    BLINK_START = 5        # Seconds left when a patty starts blinking
+    BLINK_INTERVAL = 0.4   # Seconds per blink phase
+    DONE_GRACE = 1         # Seconds a patty stays on screen showing 0
+
+    def __init__(self, clock=time.monotonic, on_tick=None, on_blink=None, on_done=None):
+        self.clock = clock
+        self.on_tick = on_tick
+        self.on_blink = on_blink
+        self.on_done = on_done
+
+        self.timers = {}  # key -> {'finish', 'blink_start', 'tick', 'blink'}
+        self.heap = []    # (deadline, seq, key, kind), stale entries are skipped lazily
+        self.seq = itertools.count()
+
+    def __len__(self):
+        return len(self.timers)
+
+    def __contains__(self, key):
+        return key in self.timers
+
+    def add(self, key, duration):
+        """Starts a countdown of `duration` seconds for `key`."""
+        now = self.clock()
+        finish = now + duration
+        timer = {'finish': finish, 'blink_start': max(now, finish - self.BLINK_START), 'tick': None, 'blink': None}
+        self.timers[key] = timer
+        self._push(key, timer, 'tick', self._next_tick(timer, now))
+        self._push(key, timer, 'blink', timer['blink_start'])
+
+    def remove(self, key):
+        """Cancels a timer. Its heap entries are dropped when they surface."""
+        self.timers.pop(key, None)
+
+    def remaining(self, key, now=None):
+        """Whole seconds left on the timer, counting down to 0."""
+        timer = self.timers[key]
+        now = self.clock() if now is None else now
+        return max(0, math.ceil(timer['finish'] - now - EPSILON))
+
+    def next_deadline(self):
+        """Monotonic time of the next live event, or None when idle."""
+        while self.heap:
+            deadline, seq, key, kind = self.heap[0]
+            timer = self.timers.get(key)
+            if timer is not None and timer[kind] == seq:
+                return deadline
+            heapq.heappop(self.heap)
+        return None
+
+    def next_delay(self):
+        """Seconds until the next event is due, or None when idle."""
+        deadline = self.next_deadline()
+        if deadline is None:
+            return None
+        return max(0.0, deadline - self.clock())
+
+    def run_due(self):
+        """Fires every event whose deadline has passed. Returns the number fired."""
+        now = self.clock()
+        fired = 0
+        while self.heap and self.heap[0][0] <= now + EPSILON:
+            deadline, seq, key, kind = heapq.heappop(self.heap)
+            timer = self.timers.get(key)
+            if timer is None or timer[kind] != seq:
+                continue
+            fired += 1
+
+            if kind == 'tick':
+                if now + EPSILON >= timer['finish'] + self.DONE_GRACE:
+                    del self.timers[key]
+                    if self.on_done:
+                        self.on_done(key)
+                    continue
+                if self.on_tick:
+                    self.on_tick(key, self.remaining(key, now))
+                self._push(key, timer, 'tick', self._next_tick(timer, now))
+            else:
+                phase = int((now - timer['blink_start']) / self.BLINK_INTERVAL + EPSILON)
+                if self.on_blink:
+                    self.on_blink(key, phase % 2 == 1)  # Phase 0 is dark, like the first toggle
+                self._push(key, timer, 'blink', timer['blink_start'] + (phase + 1) * self.BLINK_INTERVAL)
+        return fired
+
+    def _next_tick(self, timer, now):
+        """Deadline at which the displayed seconds next change (or the timer ends)."""
+        left = max(0, math.ceil(timer['finish'] - now - EPSILON))
+        if left == 0:
+            return timer['finish'] + self.DONE_GRACE
+        return timer['finish'] - (left - 1)
+
+    def _push(self, key, timer, kind, deadline):
+        seq = next(self.seq)
+        timer[kind] = seq
+        heapq.heappush(self.heap, (deadline, seq, key, kind))
+
+
+class FakeClock:
+    """Manually advanced clock for driving the scheduler without Tk or real time."""
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def simulate(count=10000, max_duration=60, seed=0, jitter=0.05):
+    """Runs `count` patties to completion on a fake clock and checks for drift.
+
+    Every wakeup is made up to `jitter` seconds late, like a busy Tk loop would.
+    Returns a dict with the event counts and the worst removal error in seconds.
+    """
+    rng = random.Random(seed)
+    clock = FakeClock()
+    expected_done = {}
+    actual_done = {}
+    ticks = blinks = 0
+
+    def on_tick(key, left):
+        nonlocal ticks
+        ticks += 1
+
+    def on_blink(key, lit):
+        nonlocal blinks
+        blinks += 1
+
+    scheduler = PattyScheduler(clock, on_tick, on_blink, lambda key: actual_done.__setitem__(key, clock()))
+    wakeups = 0
+    started = time.perf_counter()
+    for key in range(count):
+        clock.advance(rng.random() * 0.01)
+        if scheduler.next_delay() == 0:
+            scheduler.run_due()
+            wakeups += 1
+        duration = rng.randint(1, max_duration)
+        expected_done[key] = clock() + duration + PattyScheduler.DONE_GRACE
+        scheduler.add(key, duration)
+
+    while True:
+        delay = scheduler.next_delay()
+        if delay is None:
+            break
+        clock.advance(delay + rng.random() * jitter)
+        scheduler.run_due()
+        wakeups += 1
+    elapsed = time.perf_counter() - started
+
+    worst = max(actual_done[key] - expected_done[key] for key in expected_done)
+    return {'patties': count, 'wakeups': wakeups, 'ticks': ticks, 'blinks': blinks,
+            'max_late': worst, 'seconds': elapsed}
+
+
+if __name__ == "__main__":
+    result = simulate()
+    print(f"{result['patties']} patties, {result['wakeups']} wakeups, {result['ticks']} ticks, "
+          f"{result['blinks']} blinks in {result['seconds']:.2f}s")
+    print(f"Worst removal lateness: {result['max_late'] * 1000:.1f} ms (bounded by wakeup jitter, no drift)")
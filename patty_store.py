@@ -0,0 +1,80 @@
+import numpy as np
+
+# Color levels, indexed by PattyStore.color_levels()
+PATTY_COLORS = ("red", "orange", "green")
+TEXT_COLORS = ("white", "black", "white")
+COLOR_THRESHOLDS = np.array([6, 11])  # >5 seconds is orange, >10 seconds is green
+
+
+class PattyStore:
+    """Structure-of-arrays table of patties with stable integer IDs.
+
+    A patty ID is its row in the arrays. Freed rows go on a free list and are
+    reused, so add, remove and lookup are all O(1). Canvas item IDs are 0 when
+    the patty has not been drawn yet (Tk never hands out item 0).
+    """
+
+    FIELDS = {
+        'x': np.int32, 'y': np.int32, 'time': np.int32,
+        'circle': np.int64, 'text': np.int64,
+        'drawn_x': np.int32, 'drawn_y': np.int32, 'drawn_time': np.int32, 'drawn_level': np.int8,
+        'blinking': np.bool_, 'blink_state': np.bool_, 'alive': np.bool_,
+    }
+
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        for name, dtype in self.FIELDS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self.free = list(range(capacity - 1, -1, -1))  # Pop from the end -> lowest ID first
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, patty_id):
+        return 0 <= patty_id < self.capacity and bool(self.alive[patty_id])
+
+    def add(self, x, y, time_value):
+        """Stores a new patty and returns its ID."""
+        if not self.free:
+            self._grow()
+        patty_id = self.free.pop()
+        for name in self.FIELDS:
+            getattr(self, name)[patty_id] = 0
+        self.x[patty_id] = x
+        self.y[patty_id] = y
+        self.time[patty_id] = time_value
+        self.drawn_time[patty_id] = -1  # Forces the first draw
+        self.drawn_level[patty_id] = -1
+        self.blink_state[patty_id] = True
+        self.alive[patty_id] = True
+        self.count += 1
+        return patty_id
+
+    def remove(self, patty_id):
+        if patty_id not in self:
+            return
+        self.alive[patty_id] = False
+        self.circle[patty_id] = self.text[patty_id] = 0
+        self.free.append(patty_id)
+        self.count -= 1
+
+    def ids(self):
+        """IDs of all live patties, in ascending order."""
+        return np.flatnonzero(self.alive)
+
+    def color_levels(self, ids=None):
+        """Index into PATTY_COLORS/TEXT_COLORS for each patty, computed for all at once."""
+        ids = self.ids() if ids is None else ids
+        return np.digitize(self.time[ids], COLOR_THRESHOLDS)
+
+    def _grow(self):
+        """Doubles every array. Existing IDs keep their rows."""
+        old = self.capacity
+        self.capacity *= 2
+        for name in self.FIELDS:
+            array = getattr(self, name)
+            grown = np.zeros(self.capacity, dtype=array.dtype)
+            grown[:old] = array
+            setattr(self, name, grown)
+        self.free.extend(range(self.capacity - 1, old - 1, -1))
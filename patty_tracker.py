@@ -0,0 +1,152 @@
+import math
+from collections import defaultdict
+
+from perf_metrics import metrics
+
+
+class Track:
+    """One patty followed across frames."""
+
+    def __init__(self, track_id, box):
+        self.id = track_id
+        self.box = box           # (x, y, w, h) in frame pixels
+        self.detected_box = box  # Last box that came from a real detection
+        self.velocity = (0.0, 0.0)
+        self.hits = 1            # Frames where a detection was matched
+        self.missed = 0          # Detection rounds in a row without a match
+        self.confirmed = False
+
+    @property
+    def centroid(self):
+        return box_center(self.box)
+
+
+def box_center(box):
+    x, y, w, h = box
+    return x + w / 2, y + h / 2
+
+
+def box_iou(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    w = min(ax + aw, bx + bw) - max(ax, bx)
+    h = min(ay + ah, by + bh) - max(ay, by)
+    if w <= 0 or h <= 0:
+        return 0.0
+    inter = w * h
+    return inter / (aw * ah + bw * bh - inter)
+
+
+class PattyTracker:
+    """Gives detected patties stable IDs using centroid/IoU association.
+
+    Tracks are bucketed in a spatial grid so each detection is only compared
+    with tracks in its own and neighbouring cells, not with every track. Full
+    detection runs every `detect_every` frames; frames in between only move
+    tracks along their last velocity.
+
+    Callbacks receive a Track: on_new once a track is confirmed, on_update
+    whenever a confirmed track moves, on_lost when it is dropped.
+    """
+
+    def __init__(self, detect_every=5, cell_size=150, max_distance=120, min_iou=0.1,
+                 confirm_hits=3, max_missed=3, on_new=None, on_update=None, on_lost=None):
+        self.detect_every = detect_every
+        self.cell_size = cell_size
+        self.max_distance = max_distance
+        self.min_iou = min_iou
+        self.confirm_hits = confirm_hits
+        self.max_missed = max_missed
+        self.on_new = on_new
+        self.on_update = on_update
+        self.on_lost = on_lost
+
+        self.tracks = {}
+        self.next_id = 0
+        self.frame_index = 0
+
+    def step(self, frame, detect):
+        """Advances one frame. `detect(frame)` is only called every `detect_every` frames.
+
+        Returns the current list of confirmed tracks.
+        """
+        if self.frame_index % self.detect_every == 0:
+            with metrics.span("full_detection"):  # Timed apart from the cheap predict-only frames
+                boxes = detect(frame)
+            self.update(boxes)
+        else:
+            self.predict()
+        self.frame_index += 1
+        return [track for track in self.tracks.values() if track.confirmed]
+
+    def predict(self):
+        """Cheap in-between step: moves every track by its per-frame velocity."""
+        for track in self.tracks.values():
+            vx, vy = track.velocity
+            if vx or vy:
+                x, y, w, h = track.box
+                track.box = (int(round(x + vx)), int(round(y + vy)), w, h)
+                if track.confirmed and self.on_update:
+                    self.on_update(track)
+
+    def update(self, boxes):
+        """Associates a fresh set of detections with the existing tracks."""
+        grid = defaultdict(list)
+        for track in self.tracks.values():
+            grid[self._cell(track.centroid)].append(track)
+
+        # Score only nearby pairs, then match greedily from the best score down
+        pairs = []
+        for index, box in enumerate(boxes):
+            cx, cy = box_center(box)
+            col, row = self._cell((cx, cy))
+            for dc in (-1, 0, 1):
+                for dr in (-1, 0, 1):
+                    for track in grid.get((col + dc, row + dr), ()):
+                        tx, ty = track.centroid
+                        distance = math.hypot(cx - tx, cy - ty)
+                        overlap = box_iou(box, track.box)
+                        if distance <= self.max_distance or overlap >= self.min_iou:
+                            pairs.append((overlap - distance / self.max_distance, index, track.id))
+        pairs.sort(reverse=True)
+
+        matched_boxes, matched_tracks = set(), set()
+        for _, index, track_id in pairs:
+            if index in matched_boxes or track_id in matched_tracks:
+                continue
+            matched_boxes.add(index)
+            matched_tracks.add(track_id)
+            self._match(self.tracks[track_id], boxes[index])
+
+        for track_id in list(self.tracks):
+            if track_id not in matched_tracks:
+                track = self.tracks[track_id]
+                track.missed += 1
+                track.velocity = (0.0, 0.0)
+                if track.missed > self.max_missed:
+                    del self.tracks[track_id]
+                    if track.confirmed and self.on_lost:
+                        self.on_lost(track)
+
+        for index, box in enumerate(boxes):
+            if index not in matched_boxes:
+                self.tracks[self.next_id] = Track(self.next_id, tuple(box))
+                self.next_id += 1
+
+    def _match(self, track, box):
+        old_x, old_y = box_center(track.detected_box)
+        track.box = track.detected_box = tuple(box)
+        new_x, new_y = track.centroid
+        # Velocity per frame, so predict() can spread the motion over the skipped frames
+        track.velocity = ((new_x - old_x) / self.detect_every, (new_y - old_y) / self.detect_every)
+        track.hits += 1
+        track.missed = 0
+        if not track.confirmed and track.hits >= self.confirm_hits:
+            track.confirmed = True
+            if self.on_new:
+                self.on_new(track)
+        elif track.confirmed and self.on_update:
+            self.on_update(track)
+
+    def _cell(self, point):
+        return int(point[0] // self.cell_size), int(point[1] // self.cell_size)
@@ -0,0 +1,151 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+
+class Metrics:
+    """Thread-safe timing spans and gauges for the whole app.
+
+    Timings keep the last `window` samples per name for percentiles, plus
+    running counts and totals. Capture, processing and Tk code all record
+    into the shared `metrics` instance below.
+    """
+
+    def __init__(self, window=300):
+        self.window = window
+        self.lock = threading.Lock()
+        self.samples = {}
+        self.counts = {}
+        self.totals = {}
+        self.gauges = {}
+
+    @contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name, seconds):
+        with self.lock:
+            if name not in self.samples:
+                self.samples[name] = deque(maxlen=self.window)
+                self.counts[name] = 0
+                self.totals[name] = 0.0
+            self.samples[name].append(seconds)
+            self.counts[name] += 1
+            self.totals[name] += seconds
+
+    def set_gauge(self, name, value):
+        with self.lock:
+            self.gauges[name] = value
+
+    def percentile_ms(self, name, q, last=None):
+        """Percentile `q` of the kept samples in ms, or of only the `last` ones."""
+        with self.lock:
+            samples = list(self.samples.get(name, ()))
+        if last:
+            samples = samples[-last:]
+        return float(np.percentile(samples, q) * 1000) if samples else 0.0
+
+    def snapshot(self):
+        """Current timing statistics (in ms) and gauges as a plain dict."""
+        with self.lock:
+            samples = {name: np.array(values) for name, values in self.samples.items()}
+            counts, totals, gauges = dict(self.counts), dict(self.totals), dict(self.gauges)
+        timings = {}
+        for name, values in samples.items():
+            if not len(values):
+                continue
+            p50, p95 = np.percentile(values, [50, 95]) * 1000
+            timings[name] = {
+                'count': counts[name],
+                'total_s': totals[name],
+                'mean_ms': float(values.mean() * 1000),
+                'p50_ms': float(p50),
+                'p95_ms': float(p95),
+                'max_ms': float(values.max() * 1000),
+            }
+        return {'time': time.time(), 'timings': timings, 'gauges': gauges}
+
+
+metrics = Metrics()
+
+
+def to_prometheus(snapshot, prefix="cooking"):
+    """Renders a snapshot in the Prometheus text exposition format."""
+    lines = [f"# TYPE {prefix}_span_seconds summary"]
+    for name, timing in sorted(snapshot['timings'].items()):
+        lines.append(f'{prefix}_span_seconds{{span="{name}",quantile="0.5"}} {timing["p50_ms"] / 1000:.6f}')
+        lines.append(f'{prefix}_span_seconds{{span="{name}",quantile="0.95"}} {timing["p95_ms"] / 1000:.6f}')
+        lines.append(f'{prefix}_span_seconds_sum{{span="{name}"}} {timing["total_s"]:.6f}')
+        lines.append(f'{prefix}_span_seconds_count{{span="{name}"}} {timing["count"]}')
+    for name, value in sorted(snapshot['gauges'].items()):
+        lines.append(f"# TYPE {prefix}_{name} gauge")
+        lines.append(f"{prefix}_{name} {value}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsExporter:
+    """Periodically appends a JSON line and rewrites a Prometheus text file, from the Tk loop."""
+
+    def __init__(self, root, jsonl_path="metrics.jsonl", prom_path="metrics.prom", interval=10.0, source=metrics):
+        self.root = root
+        self.jsonl_path = jsonl_path
+        self.prom_path = prom_path
+        self.interval = interval
+        self.source = source
+        self.job = None
+
+    def start(self):
+        self.job = self.root.after(int(self.interval * 1000), self.export)
+
+    def stop(self):
+        if self.job:
+            self.root.after_cancel(self.job)
+            self.job = None
+
+    def export(self):
+        self.write()
+        self.start()
+
+    def write(self):
+        """Writes the current snapshot to both files right away."""
+        snapshot = self.source.snapshot()
+        try:
+            if self.jsonl_path:
+                with open(self.jsonl_path, "a") as f:
+                    f.write(json.dumps(snapshot) + "\n")
+            if self.prom_path:
+                # Write then rename, so a scraper never sees a half-written file
+                with open(self.prom_path + ".tmp", "w") as f:
+                    f.write(to_prometheus(snapshot))
+                os.replace(self.prom_path + ".tmp", self.prom_path)
+        except OSError as e:
+            print(f"Warning: Could not export metrics: {e}")
+
+
+class TkLagMonitor:
+    """Measures Tk event-loop lag: how late an after() callback runs compared to its deadline."""
+
+    def __init__(self, root, interval_ms=100, source=metrics):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.source = source
+        self.expected = None
+
+    def start(self):
+        self.expected = time.perf_counter() + self.interval_ms / 1000
+        self.root.after(self.interval_ms, self._check)
+
+    def _check(self):
+        lag = max(0.0, time.perf_counter() - self.expected)
+        self.source.record("tk_lag", lag)
+        self.source.set_gauge("tk_lag_ms", round(lag * 1000, 2))
+        self.start()
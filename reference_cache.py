@@ -0,0 +1,95 @@
+import json
+import os
+
+import cv2
+import numpy as np
+
+from cooking_classifier import REFERENCE_IMAGES, dominant_hue
+
+CACHE_FILE = ".reference_cache.npz"
+THUMBNAIL_SIZE = (600, 200)  # Width, height of the Burger Vision composite
+
+
+class ReferenceProfile:
+    """Dominant hues of the reference images and the rendered RGB thumbnail.
+
+    The full-size decoded images are only needed to build the profile, so they
+    are not kept. That keeps the on-disk cache small.
+    """
+
+    def __init__(self, signature, hues, thumbnail):
+        self.signature = signature
+        self.hues = hues
+        self.thumbnail = thumbnail
+
+
+_profiles = {}  # Signature -> ReferenceProfile, for this process
+
+
+def file_signature(paths):
+    """Identifies the exact reference files by path, mtime and size. None if one is missing."""
+    entries = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        entries.append([os.path.abspath(path), stat.st_mtime_ns, stat.st_size])
+    return json.dumps(entries)
+
+
+def build_profile(paths, signature):
+    """Decodes and analyzes the reference images. None if any of them can't be read."""
+    images = [cv2.imread(path) for path in paths]
+    if any(image is None for image in images):
+        return None
+
+    height, width, _ = images[0].shape
+    images = [images[0]] + [cv2.resize(image, (width, height)) for image in images[1:]]
+    hues = [dominant_hue(cv2.cvtColor(image, cv2.COLOR_BGR2HSV)) for image in images]
+
+    combined = cv2.cvtColor(np.hstack(images), cv2.COLOR_BGR2RGB)
+    thumbnail = cv2.resize(combined, THUMBNAIL_SIZE, interpolation=cv2.INTER_AREA)
+    return ReferenceProfile(signature, hues, thumbnail)
+
+
+def read_cache(cache_file, signature):
+    """Loads the profile from disk if it was built from the same files."""
+    try:
+        with np.load(cache_file) as data:
+            if str(data["signature"]) != signature:
+                return None
+            return ReferenceProfile(signature, [int(h) for h in data["hues"]], data["thumbnail"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def write_cache(cache_file, profile):
+    try:
+        with open(cache_file, "wb") as f:
+            np.savez_compressed(f, signature=np.array(profile.signature),
+                                hues=np.array(profile.hues), thumbnail=profile.thumbnail)
+    except OSError as e:
+        print(f"Warning: Could not write reference cache: {e}")
+
+
+def load_reference_profile(paths=REFERENCE_IMAGES, cache_file=CACHE_FILE):
+    """Returns the reference profile, computing it only when a reference image changed.
+
+    Lookups go memory, then the on-disk cache, then a full rebuild. Returns None
+    if any reference image is missing or unreadable.
+    """
+    signature = file_signature(paths)
+    if signature is None:
+        return None
+    profile = _profiles.get(signature)
+    if profile is None:
+        profile = read_cache(cache_file, signature)
+        if profile is None:
+            profile = build_profile(paths, signature)
+            if profile is None:
+                return None
+            write_cache(cache_file, profile)
+        _profiles.clear()  # Only the current set of files is worth keeping
+        _profiles[signature] = profile
+    return profile
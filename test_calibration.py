@@ -0,0 +1,34 @@
+import cv2
+import numpy as np
+import pytest
+
+from calibration import CoordinateMapper, checkerboard_squares, find_checkerboard, fit_homography
+
+SIZE = (1280, 720)
+
+
+def draw_checkerboard(width, height):
+    image = np.full((height, width, 3), 255, dtype=np.uint8)
+    squares, corners = checkerboard_squares(width, height)
+    for x0, y0, x1, y1 in squares:
+        cv2.rectangle(image, (round(x0), round(y0)), (round(x1) - 1, round(y1) - 1), (0, 0, 0), -1)
+    return image, corners
+
+
+@pytest.mark.parametrize("mirrored", [False, True])
+def test_mapping_round_trip(mirrored):
+    """A camera that sees the canvas exactly maps every point back onto itself, mirrored frames included."""
+    width, height = SIZE
+    image, canvas_corners = draw_checkerboard(width, height)
+    if mirrored:
+        image = cv2.flip(image, 1)  # Like the app's frames
+    homography, error = fit_homography(find_checkerboard(image), canvas_corners)
+    assert error < 1
+
+    mapper = CoordinateMapper(homography, SIZE, SIZE)
+    canvas_points = np.array([(200, 150), (1000, 600), (640, 360)])
+    camera_points = canvas_points.copy()
+    if mirrored:
+        camera_points[:, 0] = width - 1 - camera_points[:, 0]
+    mapped = mapper.map(camera_points, SIZE, SIZE)
+    assert np.abs(mapped - canvas_points).max() <= 2
@@ -0,0 +1,105 @@
+"""pytest-benchmark suite for the patty engine and scheduler.
+
+Run with:
+    python -m pytest test_patty_engine.py
+    python -m pytest test_patty_engine.py --benchmark-skip   # Assertions only
+"""
+import tracemalloc
+
+import pytest
+
+from patty_benchmark import RecordingCanvas, build_simulation
+from patty_engine import CanvasRenderer, ManualTimers, PattySimulation
+from patty_scheduler import FakeClock, simulate
+
+SIZES = (10, 100, 1000)
+ROUNDS = 100  # Simulated seconds per benchmark, well short of the shortest patty (600 s)
+
+
+@pytest.mark.parametrize("count", SIZES)
+def test_tick(benchmark, count):
+    """One scheduler tick in which every patty's displayed second changes."""
+    simulation, clock, canvas = build_simulation(count)
+
+    def advance():
+        clock.advance(1.0)
+
+    benchmark.pedantic(simulation.scheduler.run_due, setup=advance, rounds=ROUNDS)
+    assert len(simulation) == count
+
+
+@pytest.mark.parametrize("count", SIZES)
+def test_redraw(benchmark, count):
+    """The redraw after a tick only updates each patty's text, the colors stay until a level changes."""
+    simulation, clock, canvas = build_simulation(count)
+    canvas.calls.clear()
+
+    def tick():
+        clock.advance(1.0)
+        simulation.scheduler.run_due()
+
+    benchmark.pedantic(simulation.redraw, setup=tick, rounds=ROUNDS)
+    assert sum(canvas.calls.values()) == count * ROUNDS
+
+
+def test_colors_only_change_at_thresholds():
+    clock = FakeClock()
+    canvas = RecordingCanvas()
+    simulation = PattySimulation(ManualTimers(clock), clock, CanvasRenderer(canvas))
+    simulation.add(100, 100, 12)
+    simulation.redraw()
+    calls = []
+    for _ in range(4):
+        canvas.calls.clear()
+        clock.advance(1.0)
+        simulation.scheduler.run_due()
+        simulation.redraw()
+        calls.append(canvas.calls["itemconfig"])
+    assert calls == [1, 2, 1, 1]  # Green to orange at 10 s recolors the text and the circle
+
+
+@pytest.mark.parametrize("count", SIZES)
+def test_memory(count):
+    tracemalloc.start()
+    build_simulation(count)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert memory < 16 * 1024 + count * 1024  # Well under a kilobyte per patty
+
+
+def test_10k_patties_no_drift():
+    """Removals are late by at most the wakeup jitter, however many patties and ticks pile up."""
+    result = simulate(count=10000, jitter=0.05)
+    assert result['patties'] == 10000
+    assert result['max_late'] <= 0.05 + 1e-6
+    assert result['max_late'] >= 0  # Never removed early either
+
+
+def test_cancelled_job_stays_cancelled():
+    clock = FakeClock()
+    timers = ManualTimers(clock)
+    ran = []
+    job = timers.call_later(1000, lambda: ran.append("cancelled"))
+    timers.call_later(500, lambda: ran.append("kept"))
+    timers.cancel(job)
+    clock.advance(0.6)
+    timers.run_pending()
+    clock.advance(1.0)
+    timers.run_pending()
+    assert ran == ["kept"]
+    assert not timers.pending
+
+
+def test_cancelling_a_finished_job_leaves_nothing_behind():
+    clock = FakeClock()
+    timers = ManualTimers(clock)
+    job = None
+
+    def flush():
+        timers.cancel(job)  # Like PattyLog.flush cancelling its own, running job
+
+    job = timers.call_later(100, flush)
+    clock.advance(0.2)
+    timers.run_pending()
+    timers.cancel(job)
+    assert not timers.pending